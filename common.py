@@ -2,13 +2,18 @@
 Common functionality for generator scripts.
 """
 
-import collections
 import csv
 import re
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
-from os import makedirs, path
+from functools import lru_cache
+from itertools import islice
+from os import getpid, makedirs, path, replace, urandom
+from uuid import UUID
 
-from typing import Any, Dict, Iterable, List, OrderedDict, Union
+from typing import Any, Callable, Dict, Iterable, List, Set, Tuple, TypeVar, Union
+
+T = TypeVar('T')
 
 # String escape sequences
 STRING_ESCAPE_SEQUENCES = (
@@ -22,29 +27,130 @@ STRING_ESCAPE_SEQUENCES = (
     ('"', '\\"'),
 )
 
+# Number of random UUIDs fetched from the OS at once by new_uuid()
+UUID_POOL_SIZE = 256
+_uuid_pool: List[str] = []
+_uuid_pool_pid = 0
+
+# Keys of each UUID cache when it was loaded, see save_cache()
+_loaded_cache_keys: Dict[str, Set[str]] = {}
+
+# UUID caches returned by init_cache(), see init_cache_worker()
+_loaded_caches: Dict[str, Dict[str, str]] = {}
+
 
 def init_cache(uuid_cache_file: str) -> Dict[str, str]:
     print('Loading cache: {}'.format(uuid_cache_file))
-    uuid_cache: OrderedDict[str, str] = collections.OrderedDict()
     try:
         with open(uuid_cache_file, 'r') as f:
-            reader = csv.reader(f, delimiter=',', quotechar='"')
-            for row in reader:
-                uuid_cache[row[0]] = row[1]
+            # Each row is a (key, uuid) pair, let dict() consume them directly
+            cache = dict(csv.reader(f, delimiter=',', quotechar='"'))
     except FileNotFoundError:
-        pass
-    return uuid_cache
+        cache = {}
+    _loaded_cache_keys[uuid_cache_file] = set(cache)
+    _loaded_caches[uuid_cache_file] = cache
+    return cache
 
 
 def save_cache(uuid_cache_file: str, uuid_cache: Dict[str, str]) -> None:
+    # Cache entries are never modified once created, so if no keys were added
+    # since loading, the file is still up to date.
+    if uuid_cache.keys() == _loaded_cache_keys.get(uuid_cache_file):
+        print('Cache unchanged: {}'.format(uuid_cache_file))
+        return
     print('Saving cache: {}'.format(uuid_cache_file))
-    with open(uuid_cache_file, 'w') as f:
+    # Write to a temporary file first and then move it over the old cache, so
+    # an interrupted run can never leave a truncated cache behind (which
+    # would lead to new UUIDs for existing library elements).
+    tmp_file = uuid_cache_file + '.tmp'
+    with open(tmp_file, 'w') as f:
         writer = csv.writer(f, delimiter=',', quotechar='"', lineterminator='\n')
-        for k, v in sorted(uuid_cache.items()):
-            writer.writerow([k, v])
+        writer.writerows(sorted(uuid_cache.items()))
+    replace(tmp_file, uuid_cache_file)
+    _loaded_cache_keys[uuid_cache_file] = set(uuid_cache)
     print('Done, cached {} UUIDs'.format(len(uuid_cache)))
 
 
+def init_cache_worker(uuid_cache_file: str, uuid_cache: Dict[str, str]) -> None:
+    """
+    Initializer for worker processes generating library elements in parallel.
+
+    Replaces the content of the cache which the worker loaded from
+    `uuid_cache_file` with `uuid_cache` of the main process. The cache is
+    updated in place, so the generator module holding it sees the entries.
+    """
+    cache = _loaded_caches.setdefault(uuid_cache_file, {})
+    # With the 'fork' start method, the worker already inherited the cache
+    if cache is not uuid_cache:
+        cache.clear()
+        cache.update(uuid_cache)
+
+
+def new_cache_entries(uuid_cache: Dict[str, str], cache_size: int) -> Dict[str, str]:
+    """
+    Return the entries added to `uuid_cache` since it contained `cache_size`
+    entries, e.g. to send them from a worker process back to the main process.
+
+    This relies on UUID cache entries only ever being appended: Entries must
+    never be removed or reinserted, otherwise the entries at the end of the
+    (insertion ordered) dict are not the new ones.
+    """
+    return dict(islice(reversed(uuid_cache.items()), len(uuid_cache) - cache_size))
+
+
+def generate_all(
+    generate: Callable[..., Tuple[T, Dict[str, str]]],
+    args: Iterable[Tuple[Any, ...]],
+    uuid_cache_file: str,
+    uuid_cache: Dict[str, str],
+    parallel: bool,
+) -> List[T]:
+    """
+    Call `generate(*a)` for every tuple `a` in `args` and return the results
+    in order.
+
+    `generate` must return its result together with the UUID cache entries it
+    added (see `new_cache_entries()`), which are merged into `uuid_cache`.
+
+    Generating 3D models is slow, so with `parallel` set (usually when 3D
+    models are generated) the calls run in a process pool whose workers start
+    with a copy of `uuid_cache`. Otherwise, the process startup would take
+    longer than the generation itself, so the calls run one after another.
+    """
+    if parallel:
+        with ProcessPoolExecutor(
+            initializer=init_cache_worker, initargs=(uuid_cache_file, uuid_cache)
+        ) as executor:
+            futures = [executor.submit(generate, *a) for a in args]
+            results = [future.result() for future in futures]
+    else:
+        results = [generate(*a) for a in args]
+    ret: List[T] = []
+    for result, cache_entries in results:
+        uuid_cache.update(cache_entries)
+        ret.append(result)
+    return ret
+
+
+def new_uuid() -> str:
+    """
+    Return a new random (version 4) UUID as string.
+
+    Equivalent to `str(uuid4())`, but the random bytes are fetched from the OS
+    in batches instead of once per UUID. The pool is refilled in forked child
+    processes so they never hand out the same UUIDs as their parent.
+    """
+    global _uuid_pool_pid
+    pid = getpid()
+    if not _uuid_pool or _uuid_pool_pid != pid:
+        raw = urandom(16 * UUID_POOL_SIZE)
+        _uuid_pool[:] = [
+            str(UUID(bytes=raw[i : i + 16], version=4)) for i in range(0, len(raw), 16)
+        ]
+        _uuid_pool_pid = pid
+    return _uuid_pool.pop()
+
+
 def now() -> str:
     """
     Return current timestamp as string.
@@ -61,9 +167,13 @@ def escape_string(string: str) -> str:
     return string
 
 
+@lru_cache(maxsize=4096)
 def format_float(number: float) -> str:
     """
     Format a float according to LibrePCB normalization rules.
+
+    Memoized, because generators format the same grid coordinates and
+    dimensions over and over again.
     """
     formatted = '{:.3f}'.format(number)
     if formatted == '-0.000':
@@ -91,13 +201,6 @@ def format_ipc_dimension(number: float, decimal_places: int = 2) -> str:
     return str(int(round(number, 6 - decimal_places)))
 
 
-def indent(level: int, lines: Iterable[str]) -> List[str]:
-    """
-    Indent the lines by the specified level.
-    """
-    return [' ' * level + line for line in lines]
-
-
 def sign(val: Union[int, float]) -> int:
     """
     Return 1 for positive or zero values, -1 otherwise.
@@ -144,10 +247,27 @@ def serialize_common(
     Centralized serialize() implementation shared between Component, Symbol, Device, Package
     """
     dir_path = path.join(output_directory, uuid)
-    if not (path.exists(dir_path) and path.isdir(dir_path)):
-        makedirs(dir_path)
-    with open(path.join(dir_path, f'.librepcb-{short_type}'), 'w', newline='\n') as f:
-        f.write('1\n')
-    with open(path.join(dir_path, f'{long_type}.lp'), 'w', newline='\n') as f:
-        f.write(str(serializable))
-        f.write('\n')
+    makedirs(dir_path, exist_ok=True)
+    write_file_if_changed(path.join(dir_path, f'.librepcb-{short_type}'), '1\n')
+    write_file_if_changed(path.join(dir_path, f'{long_type}.lp'), str(serializable) + '\n')
+
+
+def write_file_if_changed(file_path: str, content: str) -> None:
+    """
+    Write `content` to the specified file, unless the file already contains
+    exactly this content. This avoids disk churn (and changed timestamps) when
+    re-generating a library which is mostly up to date.
+
+    The file is replaced atomically, so an interrupted run never leaves a
+    truncated file behind.
+    """
+    try:
+        with open(file_path, 'r', newline='\n') as f:
+            if f.read() == content:
+                return
+    except FileNotFoundError:
+        pass
+    tmp_path = file_path + '.tmp'
+    with open(tmp_path, 'w', newline='\n') as f:
+        f.write(content)
+    replace(tmp_path, file_path)
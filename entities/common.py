@@ -3,22 +3,27 @@ LibrePCB S-expression entities
 """
 
 from enum import Enum
+from functools import lru_cache
 
-from typing import List, Optional
+from typing import Any, Iterable, List, Optional, Tuple
 
 from common import escape_string, format_float
 
-from .helper import indent_entities
+from .helper import write_entities, write_to_string
 
 
 class EnumValue(Enum):
     """Helper class to represent enumeration like values"""
 
+    def __init__(self, value: str):
+        # Members are singletons, so render their S-expression only once
+        self._serialized = '({} {})'.format(self.get_name(), value)
+
     def get_name(self) -> str:
         raise NotImplementedError('Override get_name in subclass')
 
     def __str__(self) -> str:
-        return '({} {})'.format(self.get_name(), self.value)
+        return self._serialized
 
 
 class DateValue:
@@ -76,6 +81,37 @@ class FloatValue:
         return '({} {})'.format(self.name, format_float(self.value))
 
 
+class Frozen:
+    """
+    Mixin which rejects attribute assignments once `_freeze()` was called
+    """
+
+    _frozen = False
+
+    def _freeze(self) -> None:
+        object.__setattr__(self, '_frozen', True)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        if self._frozen:
+            raise AttributeError(f'{type(self).__name__} instances are immutable')
+        super().__setattr__(name, value)
+
+
+class FrozenFloatValue(Frozen, FloatValue):
+    """
+    Helper class to represent a single named float value which cannot be
+    modified after construction, thus it is serialized only once
+    """
+
+    def __init__(self, name: str, value: float):
+        super().__init__(name, value)
+        self._serialized = super().__str__()
+        self._freeze()
+
+    def __str__(self) -> str:
+        return self._serialized
+
+
 class Name(StringValue):
     def __init__(self, name: str):
         super().__init__('name', name)
@@ -234,13 +270,52 @@ class Polygon:
     def add_vertex(self, vertex: Vertex) -> None:
         self.vertices.append(vertex)
 
+    def add_vertices(self, vertices: Iterable[Vertex]) -> None:
+        self.vertices.extend(vertices)
+
+    def write_to(self, out: List[str], indent: str) -> None:
+        out.append(f'{indent}(polygon {self.uuid} {self.layer}\n')
+        out.append(f'{indent} {self.width} {self.fill} {self.grab_area}\n')
+        write_entities(out, self.vertices, indent + ' ')
+        out.append(f'{indent})\n')
+
     def __str__(self) -> str:
-        ret = '(polygon {} {}\n'.format(self.uuid, self.layer) + ' {} {} {}\n'.format(
-            self.width, self.fill, self.grab_area
-        )
-        ret += indent_entities(self.vertices)
-        ret += ')'
-        return ret
+        return write_to_string(self)
+
+
+def rectangle_vertices(
+    x1: float, y1: float, x2: float, y2: float, closed: bool = True
+) -> List[Vertex]:
+    """
+    Return the vertices of an axis-aligned rectangle with straight edges.
+
+    The vertices start at corner (x1, y1) and follow the edge to (x2, y1).
+    If `closed` is True, the first vertex is repeated at the end.
+
+    >>> [str(v) for v in rectangle_vertices(-1, 2, 1, -2, closed=False)]
+    ['(vertex (position -1.0 2.0) (angle 0.0))', '(vertex (position 1.0 2.0) (angle 0.0))', \
+'(vertex (position 1.0 -2.0) (angle 0.0))', '(vertex (position -1.0 -2.0) (angle 0.0))']
+    """
+    zero_angle = shared_angle(0)
+    vertices = [
+        Vertex(Position(x1, y1), zero_angle),
+        Vertex(Position(x2, y1), zero_angle),
+        Vertex(Position(x2, y2), zero_angle),
+        Vertex(Position(x1, y2), zero_angle),
+    ]
+    if closed:
+        vertices.append(Vertex(Position(x1, y1), zero_angle))
+    return vertices
+
+
+def path_vertices(points: Iterable[Tuple[float, float, float]]) -> List[Vertex]:
+    """
+    Return the vertices of a path given as (x, y, angle) tuples.
+
+    >>> [str(v) for v in path_vertices([(0, 1, 0), (2, 1, -180)])]
+    ['(vertex (position 0.0 1.0) (angle 0.0))', '(vertex (position 2.0 1.0) (angle -180.0))']
+    """
+    return [Vertex(Position(x, y), shared_angle(a)) for x, y, a in points]
 
 
 def generate_courtyard(
@@ -273,13 +348,8 @@ def generate_courtyard(
         width=Width(0),
         fill=Fill(False),
         grab_area=GrabArea(False),
-        vertices=[
-            Vertex(Position(-dx, dy), Angle(0)),  # NW
-            Vertex(Position(dx, dy), Angle(0)),  # NE
-            Vertex(Position(dx, -dy), Angle(0)),  # SE
-            Vertex(Position(-dx, -dy), Angle(0)),  # SW
-            # Note: Coultyards are implicitly closed, no 5th vertex needed.
-        ],
+        # Note: Coultyards are implicitly closed, no 5th vertex needed.
+        vertices=rectangle_vertices(-dx, dy, dx, -dy, closed=False),
     )
 
 
@@ -307,13 +377,15 @@ class Circle:
         self.diameter = diameter
         self.position = position
 
-    def __str__(self) -> str:
-        ret = '(circle {} {}\n'.format(self.uuid, self.layer)
-        ret += ' {} {} {} {} {}\n'.format(
-            self.width, self.fill, self.grab_area, self.diameter, self.position
+    def write_to(self, out: List[str], indent: str) -> None:
+        out.append(f'{indent}(circle {self.uuid} {self.layer}\n')
+        out.append(
+            f'{indent} {self.width} {self.fill} {self.grab_area} {self.diameter} {self.position}\n'
         )
-        ret += ')'
-        return ret
+        out.append(f'{indent})\n')
+
+    def __str__(self) -> str:
+        return write_to_string(self)
 
 
 class Value(StringValue):
@@ -348,13 +420,16 @@ class Text:
         self.position = position
         self.rotation = rotation
 
-    def __str__(self) -> str:
-        return (
-            '(text {} {} {}\n'.format(self.uuid, self.layer, self.value)
-            + ' {} {} {} {}\n'.format(self.align, self.height, self.position, self.rotation)
-            + ')'
+    def write_to(self, out: List[str], indent: str) -> None:
+        out.append(
+            f'{indent}(text {self.uuid} {self.layer} {self.value}\n'
+            f'{indent} {self.align} {self.height} {self.position} {self.rotation}\n'
+            f'{indent})\n'
         )
 
+    def __str__(self) -> str:
+        return write_to_string(self)
+
 
 class Resource:
     def __init__(self, name: str, mediatype: str, url: str):
@@ -362,11 +437,70 @@ class Resource:
         self.mediatype = mediatype
         self.url = url
 
-    def __str__(self) -> str:
-        return (
-            '(resource "{}" (mediatype "{}")\n'.format(
-                escape_string(self.name), escape_string(self.mediatype)
-            )
-            + ' (url "{}")\n'.format(escape_string(self.url))
-            + ')'
+    def write_to(self, out: List[str], indent: str) -> None:
+        out.append(
+            f'{indent}(resource "{escape_string(self.name)}"'
+            f' (mediatype "{escape_string(self.mediatype)}")\n'
+            f'{indent} (url "{escape_string(self.url)}")\n'
+            f'{indent})\n'
         )
+
+    def __str__(self) -> str:
+        return write_to_string(self)
+
+
+# Shared instances of small, frequently used value objects
+#
+# Value objects which are created over and over again with the same arguments
+# (e.g. layers or a zero rotation) can be shared between all entities instead
+# of being allocated at every call site. Since some generators modify value
+# objects in place (e.g. the rotation of a pad), the shared instances are
+# immutable: Assigning to any of their attributes raises an AttributeError.
+
+
+class _FrozenLayer(Frozen, Layer):
+    def __init__(self, layer: str):
+        super().__init__(layer)
+        self._freeze()
+
+
+class _FrozenRotation(Frozen, Rotation):
+    def __init__(self, rotation: float):
+        super().__init__(rotation)
+        self._freeze()
+
+
+class _FrozenAngle(Frozen, Angle):
+    def __init__(self, angle: float):
+        super().__init__(angle)
+        self._freeze()
+
+
+class _FrozenDescription(Frozen, Description):
+    def __init__(self, description: str):
+        super().__init__(description)
+        self._freeze()
+
+
+@lru_cache(maxsize=None)
+def shared_layer(name: str) -> Layer:
+    """Return a shared, immutable `Layer` instance"""
+    return _FrozenLayer(name)
+
+
+@lru_cache(maxsize=None)
+def shared_rotation(value: float) -> Rotation:
+    """Return a shared, immutable `Rotation` instance"""
+    return _FrozenRotation(value)
+
+
+@lru_cache(maxsize=None)
+def shared_angle(value: float) -> Angle:
+    """Return a shared, immutable `Angle` instance"""
+    return _FrozenAngle(value)
+
+
+@lru_cache(maxsize=None)
+def shared_description(value: str) -> Description:
+    """Return a shared, immutable `Description` instance"""
+    return _FrozenDescription(value)
@@ -19,7 +19,7 @@ from .common import (
     UUIDValue,
     Version,
 )
-from .helper import indent_entities
+from .helper import write_entities, write_to_string
 
 
 class DefaultValue(StringValue):
@@ -83,13 +83,15 @@ class Signal:
         self.clock = clock
         self.forced_net = forced_net
 
-    def __str__(self) -> str:
-        ret = (
-            '(signal {} {} {}\n'.format(self.uuid, self.name, self.role)
-            + ' {} {} {} {}\n'.format(self.required, self.negated, self.clock, self.forced_net)
-            + ')'
+    def write_to(self, out: List[str], indent: str) -> None:
+        out.append(
+            f'{indent}(signal {self.uuid} {self.name} {self.role}\n'
+            f'{indent} {self.required} {self.negated} {self.clock} {self.forced_net}\n'
+            f'{indent})\n'
         )
-        return ret
+
+    def __str__(self) -> str:
+        return write_to_string(self)
 
 
 class SymbolUUID(UUIDValue):
@@ -146,18 +148,17 @@ class Gate:
     def add_pin_signal_map(self, pin_signal_map: PinSignalMap) -> None:
         self.pins.append(pin_signal_map)
 
-    def __str__(self) -> str:
-        ret = (
-            '(gate {}\n'.format(self.uuid)
-            + ' {}\n'.format(self.symbol_uuid)
-            + ' {} {} {} {}\n'.format(self.position, self.rotation, self.required, self.suffix)
+    def write_to(self, out: List[str], indent: str) -> None:
+        out.append(
+            f'{indent}(gate {self.uuid}\n'
+            f'{indent} {self.symbol_uuid}\n'
+            f'{indent} {self.position} {self.rotation} {self.required} {self.suffix}\n'
         )
-        pin_lines = []
-        for pin in self.pins:
-            pin_lines.append(' {}'.format(pin))
-        ret += '\n'.join(sorted(pin_lines))
-        ret += '\n)'
-        return ret
+        out.extend(sorted(f'{indent} {pin}\n' for pin in self.pins))
+        out.append(f'{indent})\n')
+
+    def __str__(self) -> str:
+        return write_to_string(self)
 
 
 class Norm(EnumValue):
@@ -180,15 +181,17 @@ class Variant:
     def add_gate(self, gate_map: Gate) -> None:
         self.gates.append(gate_map)
 
-    def __str__(self) -> str:
-        ret = (
-            '(variant {} {}\n'.format(self.uuid, self.norm)
-            + ' {}\n'.format(self.name)
-            + ' {}\n'.format(self.description)
+    def write_to(self, out: List[str], indent: str) -> None:
+        out.append(
+            f'{indent}(variant {self.uuid} {self.norm}\n'
+            f'{indent} {self.name}\n'
+            f'{indent} {self.description}\n'
         )
-        ret += indent_entities(sorted(self.gates, key=lambda x: str(x.uuid)))
-        ret += ')'
-        return ret
+        write_entities(out, sorted(self.gates, key=lambda x: str(x.uuid)), indent + ' ')
+        out.append(f'{indent})\n')
+
+    def __str__(self) -> str:
+        return write_to_string(self)
 
 
 class Component:
@@ -229,26 +232,24 @@ class Component:
         self.approvals.append(approval)
 
     def __str__(self) -> str:
-        ret = (
-            '(librepcb_component {}\n'.format(self.uuid)
-            + ' {}\n'.format(self.name)
-            + ' {}\n'.format(self.description)
-            + ' {}\n'.format(self.keywords)
-            + ' {}\n'.format(self.author)
-            + ' {}\n'.format(self.version)
-            + ' {}\n'.format(self.created)
-            + ' {}\n'.format(self.deprecated)
-            + ' {}\n'.format(self.generated_by)
-            + ''.join([' {}\n'.format(cat) for cat in self.categories])
-            + ' {}\n'.format(self.schematic_only)
-            + ' {}\n'.format(self.default_value)
-            + ' {}\n'.format(self.prefix)
-        )
-        ret += indent_entities(self.signals)
-        ret += indent_entities(self.variants)
-        ret += indent_entities(sorted(self.approvals))
-        ret += ')'
-        return ret
+        parts: List[str] = [
+            f'(librepcb_component {self.uuid}\n',
+            f' {self.name}\n',
+            f' {self.description}\n',
+            f' {self.keywords}\n',
+            f' {self.author}\n',
+            f' {self.version}\n',
+            f' {self.created}\n',
+            f' {self.deprecated}\n',
+            f' {self.generated_by}\n',
+            ''.join(f' {cat}\n' for cat in self.categories),
+            f' {self.schematic_only}\n {self.default_value}\n {self.prefix}\n',
+        ]
+        write_entities(parts, self.signals, ' ')
+        write_entities(parts, self.variants, ' ')
+        write_entities(parts, sorted(self.approvals), ' ')
+        parts.append(')')
+        return ''.join(parts)
 
     def add_signal(self, signal: Signal) -> None:
         self.signals.append(signal)
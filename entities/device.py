@@ -18,7 +18,7 @@ from .common import (
     Version,
 )
 from .component import SignalUUID
-from .helper import indent_entities
+from .helper import write_entities, write_to_string
 
 
 class ComponentUUID(UUIDValue):
@@ -53,11 +53,13 @@ class Part:
         self.manufacturer = manufacturer
         self.attributes = attributes or []
 
+    def write_to(self, out: List[str], indent: str) -> None:
+        out.append(f'{indent}(part "{escape_string(self.mpn)}" {self.manufacturer}\n')
+        write_entities(out, self.attributes, indent + ' ')
+        out.append(f'{indent})\n')
+
     def __str__(self) -> str:
-        ret = '(part "{}" {}\n'.format(escape_string(self.mpn), self.manufacturer)
-        ret += indent_entities(self.attributes)
-        ret += ')'
-        return ret
+        return write_to_string(self)
 
     def add_attribute(self, attr: Attribute) -> None:
         self.attributes.append(attr)
@@ -109,25 +111,25 @@ class Device:
         self.approvals.append(approval)
 
     def __str__(self) -> str:
-        ret = (
-            '(librepcb_device {}\n'.format(self.uuid)
-            + ' {}\n'.format(self.name)
-            + ' {}\n'.format(self.description)
-            + ' {}\n'.format(self.keywords)
-            + ' {}\n'.format(self.author)
-            + ' {}\n'.format(self.version)
-            + ' {}\n'.format(self.created)
-            + ' {}\n'.format(self.deprecated)
-            + ' {}\n'.format(self.generated_by)
-            + ''.join([' {}\n'.format(cat) for cat in self.categories])
-        )
-        ret += indent_entities(self.resources)
-        ret += ' {}\n'.format(self.component_uuid) + ' {}\n'.format(self.package_uuid)
-        ret += indent_entities(sorted(self.pads, key=lambda x: str(x.pad_uuid)))
-        ret += indent_entities(self.parts)
-        ret += indent_entities(sorted(self.approvals))
-        ret += ')'
-        return ret
+        parts: List[str] = [
+            f'(librepcb_device {self.uuid}\n',
+            f' {self.name}\n',
+            f' {self.description}\n',
+            f' {self.keywords}\n',
+            f' {self.author}\n',
+            f' {self.version}\n',
+            f' {self.created}\n',
+            f' {self.deprecated}\n',
+            f' {self.generated_by}\n',
+            ''.join(f' {cat}\n' for cat in self.categories),
+        ]
+        write_entities(parts, self.resources, ' ')
+        parts.append(f' {self.component_uuid}\n {self.package_uuid}\n')
+        write_entities(parts, sorted(self.pads, key=lambda x: str(x.pad_uuid)), ' ')
+        write_entities(parts, self.parts, ' ')
+        write_entities(parts, sorted(self.approvals), ' ')
+        parts.append(')')
+        return ''.join(parts)
 
     def serialize(self, output_directory: str) -> None:
         serialize_common(
@@ -1,29 +1,45 @@
-from typing import Any, Iterable
+from typing import Any, Iterable, List
 
-from common import indent
 
-
-def indent_entity(entity: Any) -> str:
+def _indent_text(text: str, indent: str) -> str:
     """
-    Convert an entity to a string, indent every line of the string with a space,
-    and add a trailing newline.
+    Prefix every line of the string with `indent`, and add a trailing newline.
 
-    >>> indent_entity('(foo "1")')
-    ' (foo "1")\\n'
-    >>> indent_entity('(bar "2"\\n (baz "3")\\n)')
+    >>> _indent_text('(bar "2"\\n (baz "3")\\n)\\n', ' ')
     ' (bar "2"\\n  (baz "3")\\n )\\n'
     """
-    result = '\n'.join(indent(1, str(entity).splitlines()))
-    result += '\n'
-    return result
+    lines = text.splitlines()
+    if not lines:
+        return '\n'
+    return indent + ('\n' + indent).join(lines) + '\n'
+
+
+def write_entities(out: List[str], entities: Iterable[Any], indent: str) -> None:
+    """
+    Append every item in the specified list of entities to `out`, with each line
+    prefixed by `indent` and followed by a newline.
 
+    Entities providing a `write_to(out, indent)` method write themselves into
+    the buffer, all other entities are converted with `str()`.
 
-def indent_entities(entities: Iterable[Any]) -> str:
+    >>> out = []
+    >>> write_entities(out, ['(bar "2"\\n (baz "3")\\n)'], '  ')
+    >>> ''.join(out)
+    '  (bar "2"\\n   (baz "3")\\n  )\\n'
     """
-    Apply the `indent_entity` function to every item in the specified list of entities,
-    and return the concatenated string.
+    for entity in entities:
+        write_to = getattr(entity, 'write_to', None)
+        if write_to is not None:
+            write_to(out, indent)
+            continue
+        out.append(_indent_text(str(entity), indent))
+
 
-    >>> indent_entities(['(bar "2")', '(bar "3")'])
-    ' (bar "2")\\n (bar "3")\\n'
+def write_to_string(entity: Any) -> str:
+    """
+    Serialize an entity providing a `write_to(out, indent)` method to a string
+    without trailing newline.
     """
-    return ''.join(map(indent_entity, entities))
+    out: List[str] = []
+    entity.write_to(out, '')
+    return ''.join(out)[:-1]
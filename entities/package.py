@@ -1,4 +1,6 @@
-from typing import Iterable, List, Optional, Union
+from functools import lru_cache
+
+from typing import Dict, Iterable, List, Optional, Tuple, Union
 
 from common import format_float, serialize_common
 
@@ -12,7 +14,8 @@ from .common import (
     Deprecated,
     Description,
     EnumValue,
-    FloatValue,
+    Frozen,
+    FrozenFloatValue,
     GeneratedBy,
     Height,
     Keywords,
@@ -28,7 +31,7 @@ from .common import (
     Version,
     Vertex,
 )
-from .helper import indent_entities
+from .helper import write_entities, write_to_string
 
 
 class Package3DModel:
@@ -36,6 +39,8 @@ class Package3DModel:
     A 3D model in a package.
     """
 
+    __slots__ = ('uuid', 'name')
+
     def __init__(self, uuid: str, name: Name):
         self.uuid = uuid
         self.name = name
@@ -57,9 +62,14 @@ class Footprint3DModel:
     A 3D model reference in a footprint.
     """
 
+    __slots__ = ('uuid',)
+
     def __init__(self, uuid: str):
         self.uuid = uuid
 
+    def write_to(self, out: List[str], indent: str) -> None:
+        out.append(f'{indent}(3d_model {self.uuid})\n')
+
     def __str__(self) -> str:
         return f'(3d_model {self.uuid})\n'
 
@@ -92,15 +102,18 @@ class AssemblyType(EnumValue):
 
 
 class PackagePad:
+    __slots__ = ('uuid', 'name', '_serialized')
+
     def __init__(self, uuid: str, name: Name):
         self.uuid = uuid
         self.name = name
+        self._serialized = f'(pad {uuid} {name})'
 
     def __str__(self) -> str:
-        return '(pad {} {})'.format(self.uuid, self.name)
+        return self._serialized
 
 
-class StrokeWidth(FloatValue):
+class StrokeWidth(FrozenFloatValue):
     def __init__(self, stroke_width: float):
         super().__init__('stroke_width', stroke_width)
 
@@ -130,6 +143,21 @@ class Mirror(BoolValue):
 
 
 class StrokeText:
+    __slots__ = (
+        'uuid',
+        'layer',
+        'height',
+        'stroke_width',
+        'letter_spacing',
+        'line_spacing',
+        'align',
+        'position',
+        'rotation',
+        'auto_rotate',
+        'mirror',
+        'value',
+    )
+
     def __init__(
         self,
         uuid: str,
@@ -158,16 +186,17 @@ class StrokeText:
         self.mirror = mirror
         self.value = value
 
-    def __str__(self) -> str:
-        ret = (
-            '(stroke_text {} {}\n'.format(self.uuid, self.layer)
-            + ' {} {} {} {}\n'.format(
-                self.height, self.stroke_width, self.letter_spacing, self.line_spacing
-            )
-            + ' {} {} {}\n'.format(self.align, self.position, self.rotation)
-            + ' {} {} {}\n)'.format(self.auto_rotate, self.mirror, self.value)
+    def write_to(self, out: List[str], indent: str) -> None:
+        out.append(f'{indent}(stroke_text {self.uuid} {self.layer}\n')
+        out.append(
+            f'{indent} {self.height} {self.stroke_width} {self.letter_spacing} {self.line_spacing}\n'
         )
-        return ret
+        out.append(f'{indent} {self.align} {self.position} {self.rotation}\n')
+        out.append(f'{indent} {self.auto_rotate} {self.mirror} {self.value}\n')
+        out.append(f'{indent})\n')
+
+    def __str__(self) -> str:
+        return write_to_string(self)
 
 
 class ComponentSide(EnumValue):
@@ -187,18 +216,21 @@ class Shape(EnumValue):
         return 'shape'
 
 
-class ShapeRadius(FloatValue):
+class ShapeRadius(FrozenFloatValue):
     def __init__(self, radius_normalized: float):
         super().__init__('radius', radius_normalized)
 
 
 class Size:
+    __slots__ = ('width', 'height', '_serialized')
+
     def __init__(self, width: float, height: float):
         self.width = width
         self.height = height
+        self._serialized = f'(size {format_float(width)} {format_float(height)})'
 
     def __str__(self) -> str:
-        return '(size {} {})'.format(format_float(self.width), format_float(self.height))
+        return self._serialized
 
 
 class StopMaskConfig:
@@ -222,11 +254,29 @@ class SolderPasteConfig(EnumValue):
         return 'solder_paste'
 
 
-class CopperClearance(FloatValue):
+class CopperClearance(FrozenFloatValue):
     def __init__(self, clearance: float):
         super().__init__('clearance', clearance)
 
 
+class _FrozenStopMaskConfig(Frozen, StopMaskConfig):
+    def __init__(self, value: Union[str, float]):
+        super().__init__(value)
+        self._freeze()
+
+
+@lru_cache(maxsize=None)
+def shared_stop_mask(value: Union[str, float]) -> StopMaskConfig:
+    """Return a shared, immutable `StopMaskConfig` (see `entities.common.shared_layer`)"""
+    return _FrozenStopMaskConfig(value)
+
+
+@lru_cache(maxsize=None)
+def shared_copper_clearance(clearance: float) -> CopperClearance:
+    """Return a shared `CopperClearance` (immutable, see `entities.common.shared_layer`)"""
+    return CopperClearance(clearance)
+
+
 class PackagePadUuid(UUIDValue):
     def __init__(self, package_pad: str):
         super().__init__('package_pad', package_pad)
@@ -247,7 +297,7 @@ class PadFunction(EnumValue):
         return 'function'
 
 
-class DrillDiameter(FloatValue):
+class DrillDiameter(FrozenFloatValue):
     def __init__(self, diameter: float):
         super().__init__('diameter', diameter)
 
@@ -261,28 +311,49 @@ class Hole:
         self.vertices = vertices
         self.stop_mask = stop_mask
 
+    def write_to(self, out: List[str], indent: str) -> None:
+        out.append(f'{indent}(hole {self.uuid} {self.diameter}\n{indent} {self.stop_mask}\n')
+        write_entities(out, self.vertices, indent + ' ')
+        out.append(f'{indent})\n')
+
     def __str__(self) -> str:
-        ret = '(hole {} {}\n'.format(self.uuid, self.diameter)
-        ret += ' {}\n'.format(self.stop_mask)
-        ret += indent_entities(self.vertices)
-        ret += ')'
-        return ret
+        return write_to_string(self)
 
 
 class PadHole:
+    __slots__ = ('uuid', 'diameter', 'vertices')
+
     def __init__(self, uuid: str, diameter: DrillDiameter, vertices: List[Vertex]):
         self.uuid = uuid
         self.diameter = diameter
         self.vertices = vertices
 
+    def write_to(self, out: List[str], indent: str) -> None:
+        out.append(f'{indent}(hole {self.uuid} {self.diameter}\n')
+        write_entities(out, self.vertices, indent + ' ')
+        out.append(f'{indent})\n')
+
     def __str__(self) -> str:
-        ret = '(hole {} {}\n'.format(self.uuid, self.diameter)
-        ret += indent_entities(self.vertices)
-        ret += ')'
-        return ret
+        return write_to_string(self)
 
 
 class FootprintPad:
+    __slots__ = (
+        'uuid',
+        'side',
+        'shape',
+        'position',
+        'rotation',
+        'size',
+        'radius',
+        'stop_mask',
+        'solder_paste',
+        'copper_clearance',
+        'function',
+        'package_pad',
+        'holes',
+    )
+
     def __init__(
         self,
         uuid: str,
@@ -313,18 +384,18 @@ class FootprintPad:
         self.package_pad = package_pad
         self.holes = holes
 
-    def __str__(self) -> str:
-        ret = (
-            '(pad {} {} {}\n'.format(self.uuid, self.side, self.shape)
-            + ' {} {} {} {}\n'.format(self.position, self.rotation, self.size, self.radius)
-            + ' {} {} {} {}\n'.format(
-                self.stop_mask, self.solder_paste, self.copper_clearance, self.function
-            )
-            + ' {}\n'.format(self.package_pad)
+    def write_to(self, out: List[str], indent: str) -> None:
+        out.append(
+            f'{indent}(pad {self.uuid} {self.side} {self.shape}\n'
+            f'{indent} {self.position} {self.rotation} {self.size} {self.radius}\n'
+            f'{indent} {self.stop_mask} {self.solder_paste} {self.copper_clearance} {self.function}\n'
+            f'{indent} {self.package_pad}\n'
         )
-        ret += indent_entities(self.holes)
-        ret += ')'
-        return ret
+        write_entities(out, self.holes, indent + ' ')
+        out.append(f'{indent})\n')
+
+    def __str__(self) -> str:
+        return write_to_string(self)
 
 
 class Zone:
@@ -353,25 +424,40 @@ class Zone:
     def add_vertex(self, vertex: Vertex) -> None:
         self.vertices.append(vertex)
 
-    def __str__(self) -> str:
-        ret = '(zone {}\n'.format(self.uuid)
-        ret += ' {} {} {} {}\n'.format(
-            BoolValue('no_copper', self.no_copper),
-            BoolValue('no_planes', self.no_planes),
-            BoolValue('no_exposure', self.no_exposure),
-            BoolValue('no_devices', self.no_devices),
+    def write_to(self, out: List[str], indent: str) -> None:
+        out.append(
+            f'{indent}(zone {self.uuid}\n'
+            f'{indent} {BoolValue("no_copper", self.no_copper)}'
+            f' {BoolValue("no_planes", self.no_planes)}'
+            f' {BoolValue("no_exposure", self.no_exposure)}'
+            f' {BoolValue("no_devices", self.no_devices)}\n'
+            f'{indent} {BoolValue("top", self.top)} {BoolValue("inner", self.inner)}'
+            f' {BoolValue("bottom", self.bottom)}\n'
         )
-        ret += ' {} {} {}\n'.format(
-            BoolValue('top', self.top),
-            BoolValue('inner', self.inner),
-            BoolValue('bottom', self.bottom),
-        )
-        ret += indent_entities(self.vertices)
-        ret += ')'
-        return ret
+        write_entities(out, self.vertices, indent + ' ')
+        out.append(f'{indent})\n')
+
+    def __str__(self) -> str:
+        return write_to_string(self)
 
 
 class Footprint:
+    __slots__ = (
+        'uuid',
+        'name',
+        'description',
+        'position_3d',
+        'rotation_3d',
+        'pads',
+        'models_3d',
+        'polygons',
+        'circles',
+        'texts',
+        'holes',
+        'zones',
+        '_cache',
+    )
+
     def __init__(
         self,
         uuid: str,
@@ -386,53 +472,93 @@ class Footprint:
         self.position_3d = position_3d
         self.rotation_3d = rotation_3d
         self.pads: List[FootprintPad] = []
-        self.models_3d: List[Footprint3DModel] = []
+        # Keyed by UUID, so adding the same model twice doesn't duplicate it
+        self.models_3d: Dict[str, Footprint3DModel] = {}
         self.polygons: List[Polygon] = []
         self.circles: List[Circle] = []
         self.texts: List[StrokeText] = []
         self.holes: List[Hole] = []
         self.zones: List[Zone] = []
+        # Serialized footprint as (indent, text), reset by the add_*() methods
+        self._cache: Optional[Tuple[str, str]] = None
 
     def add_pad(self, pad: FootprintPad) -> None:
         self.pads.append(pad)
+        self._cache = None
 
     def add_3d_model(self, model: Footprint3DModel) -> None:
-        self.models_3d.append(model)
+        self.models_3d[model.uuid] = model
+        self._cache = None
 
     def add_polygon(self, polygon: Polygon) -> None:
         self.polygons.append(polygon)
+        self._cache = None
 
     def add_circle(self, circle: Circle) -> None:
         self.circles.append(circle)
+        self._cache = None
 
     def add_text(self, text: StrokeText) -> None:
         self.texts.append(text)
+        self._cache = None
 
     def add_zone(self, zone: Zone) -> None:
         self.zones.append(zone)
+        self._cache = None
 
     def add_hole(self, hole: Hole) -> None:
         self.holes.append(hole)
+        self._cache = None
+
+    def write_to(self, out: List[str], indent: str) -> None:
+        cache = self._cache
+        if cache is None or cache[0] != indent:
+            child_indent = indent + ' '
+            parts = [
+                f'{indent}(footprint {self.uuid}\n',
+                f'{child_indent}{self.name}\n',
+                f'{child_indent}{self.description}\n',
+                f'{child_indent}{self.position_3d} {self.rotation_3d}\n',
+            ]
+            models_3d = [self.models_3d[uuid] for uuid in sorted(self.models_3d)]
+            write_entities(parts, models_3d, child_indent)
+            write_entities(parts, self.pads, child_indent)
+            write_entities(parts, self.polygons, child_indent)
+            write_entities(parts, self.circles, child_indent)
+            write_entities(parts, self.texts, child_indent)
+            write_entities(parts, self.zones, child_indent)
+            write_entities(parts, self.holes, child_indent)
+            parts.append(f'{indent})\n')
+            cache = self._cache = (indent, ''.join(parts))
+        out.append(cache[1])
 
     def __str__(self) -> str:
-        ret = (
-            '(footprint {}\n'.format(self.uuid)
-            + ' {}\n'.format(self.name)
-            + ' {}\n'.format(self.description)
-            + ' {} {}\n'.format(self.position_3d, self.rotation_3d)
-        )
-        ret += indent_entities(sorted(self.models_3d))
-        ret += indent_entities(self.pads)
-        ret += indent_entities(self.polygons)
-        ret += indent_entities(self.circles)
-        ret += indent_entities(self.texts)
-        ret += indent_entities(self.zones)
-        ret += indent_entities(self.holes)
-        ret += ')'
-        return ret
+        return write_to_string(self)
 
 
 class Package:
+    __slots__ = (
+        'uuid',
+        'name',
+        'description',
+        'keywords',
+        'author',
+        'version',
+        'created',
+        'deprecated',
+        'generated_by',
+        'categories',
+        'alternative_names',
+        'assembly_type',
+        'pads',
+        'models_3d',
+        'footprints',
+        'approvals',
+        '_approvals_sorted',
+        '_str_cache',
+        '_footprint_caches',
+    )
+
     def __init__(
         self,
         uuid: str,
@@ -463,43 +589,63 @@ class Package:
         self.models_3d: List[Package3DModel] = []
         self.footprints: List[Footprint] = []
         self.approvals: List[str] = []
+        self._approvals_sorted: Optional[List[str]] = None
+        # Serialized package, reset by the add_*() methods. It is only valid
+        # as long as the footprints still hold the caches it was built from.
+        self._str_cache: Optional[str] = None
+        self._footprint_caches: List[Optional[Tuple[str, str]]] = []
 
     def add_alternative_name(self, alternative_name: AlternativeName) -> None:
         self.alternative_names.append(alternative_name)
+        self._str_cache = None
 
     def add_pad(self, pad: PackagePad) -> None:
         self.pads.append(pad)
+        self._str_cache = None
 
     def add_footprint(self, footprint: Footprint) -> None:
         self.footprints.append(footprint)
+        self._str_cache = None
 
     def add_3d_model(self, model: Package3DModel) -> None:
         self.models_3d.append(model)
+        self._str_cache = None
 
     def add_approval(self, approval: str) -> None:
         self.approvals.append(approval)
+        self._approvals_sorted = None
+        self._str_cache = None
 
     def __str__(self) -> str:
-        ret = (
-            '(librepcb_package {}\n'.format(self.uuid)
-            + ' {}\n'.format(self.name)
-            + ' {}\n'.format(self.description)
-            + ' {}\n'.format(self.keywords)
-            + ' {}\n'.format(self.author)
-            + ' {}\n'.format(self.version)
-            + ' {}\n'.format(self.created)
-            + ' {}\n'.format(self.deprecated)
-            + ' {}\n'.format(self.generated_by)
-            + ''.join([' {}\n'.format(cat) for cat in self.categories])
-            + ''.join([' {}\n'.format(alt) for alt in self.alternative_names])
-            + ' {}\n'.format(self.assembly_type)
-        )
-        ret += indent_entities(self.pads)
-        ret += indent_entities(self.models_3d)
-        ret += indent_entities(self.footprints)
-        ret += indent_entities(sorted(self.approvals))
-        ret += ')'
-        return ret
+        if self._str_cache is not None and all(
+            footprint._cache is cache
+            for footprint, cache in zip(self.footprints, self._footprint_caches)
+        ):
+            return self._str_cache
+        if self._approvals_sorted is None:
+            self._approvals_sorted = sorted(self.approvals)
+        parts: List[str] = [
+            f'(librepcb_package {self.uuid}\n',
+            f' {self.name}\n',
+            f' {self.description}\n',
+            f' {self.keywords}\n',
+            f' {self.author}\n',
+            f' {self.version}\n',
+            f' {self.created}\n',
+            f' {self.deprecated}\n',
+            f' {self.generated_by}\n',
+            ''.join(f' {cat}\n' for cat in self.categories),
+            ''.join(f' {alt}\n' for alt in self.alternative_names),
+            f' {self.assembly_type}\n',
+        ]
+        write_entities(parts, self.pads, ' ')
+        write_entities(parts, self.models_3d, ' ')
+        write_entities(parts, self.footprints, ' ')
+        write_entities(parts, self._approvals_sorted, ' ')
+        parts.append(')')
+        self._footprint_caches = [footprint._cache for footprint in self.footprints]
+        self._str_cache = ''.join(parts)
+        return self._str_cache
 
     def serialize(self, output_directory: str) -> None:
         serialize_common(
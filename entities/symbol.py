@@ -20,7 +20,7 @@ from .common import (
     Text,
     Version,
 )
-from .helper import indent_entities
+from .helper import write_entities, write_to_string
 
 
 class NamePosition:
@@ -73,15 +73,18 @@ class Pin:
         self.name_height = name_height
         self.name_align = name_align
 
-    def __str__(self) -> str:
-        return (
-            '(pin {} {}\n'.format(self.uuid, self.name)
-            + ' {} {} {}\n'.format(self.position, self.rotation, self.length)
-            + ' {} {} {}\n'.format(self.name_position, self.name_rotation, self.name_height)
-            + ' {}\n'.format(self.name_align)
-            + ')'
+    def write_to(self, out: List[str], indent: str) -> None:
+        out.append(
+            f'{indent}(pin {self.uuid} {self.name}\n'
+            f'{indent} {self.position} {self.rotation} {self.length}\n'
+            f'{indent} {self.name_position} {self.name_rotation} {self.name_height}\n'
+            f'{indent} {self.name_align}\n'
+            f'{indent})\n'
         )
 
+    def __str__(self) -> str:
+        return write_to_string(self)
+
 
 class Symbol:
     def __init__(
@@ -129,25 +132,25 @@ class Symbol:
         self.approvals.append(approval)
 
     def __str__(self) -> str:
-        ret = (
-            '(librepcb_symbol {}\n'.format(self.uuid)
-            + ' {}\n'.format(self.name)
-            + ' {}\n'.format(self.description)
-            + ' {}\n'.format(self.keywords)
-            + ' {}\n'.format(self.author)
-            + ' {}\n'.format(self.version)
-            + ' {}\n'.format(self.created)
-            + ' {}\n'.format(self.deprecated)
-            + ' {}\n'.format(self.generated_by)
-            + ''.join([' {}\n'.format(cat) for cat in self.categories])
-        )
-        ret += indent_entities(self.pins)
-        ret += indent_entities(self.polygons)
-        ret += indent_entities(self.circles)
-        ret += indent_entities(self.texts)
-        ret += indent_entities(sorted(self.approvals))
-        ret += ')'
-        return ret
+        parts: List[str] = [
+            f'(librepcb_symbol {self.uuid}\n',
+            f' {self.name}\n',
+            f' {self.description}\n',
+            f' {self.keywords}\n',
+            f' {self.author}\n',
+            f' {self.version}\n',
+            f' {self.created}\n',
+            f' {self.deprecated}\n',
+            f' {self.generated_by}\n',
+            ''.join(f' {cat}\n' for cat in self.categories),
+        ]
+        write_entities(parts, self.pins, ' ')
+        write_entities(parts, self.polygons, ' ')
+        write_entities(parts, self.circles, ' ')
+        write_entities(parts, self.texts, ' ')
+        write_entities(parts, sorted(self.approvals), ' ')
+        parts.append(')')
+        return ''.join(parts)
 
     def serialize(self, output_directory: str) -> None:
         serialize_common(
@@ -15,13 +15,20 @@ Generate pin header and socket packages.
 
 import math
 import sys
-from functools import partial
+from functools import lru_cache, partial
 from os import makedirs, path
-from uuid import uuid4
 
-from typing import Callable, Iterable, Optional, Tuple
+from typing import Callable, Dict, Iterable, Optional, Tuple
 
-from common import init_cache, now, save_cache
+from common import (
+    generate_all,
+    init_cache,
+    new_cache_entries,
+    new_uuid,
+    now,
+    save_cache,
+    write_file_if_changed,
+)
 from entities.common import (
     Align,
     Angle,
@@ -37,19 +44,21 @@ from entities.common import (
     GrabArea,
     Height,
     Keywords,
-    Layer,
     Length,
     Name,
     Polygon,
     Position,
     Position3D,
-    Rotation,
     Rotation3D,
     Text,
     Value,
     Version,
     Vertex,
     Width,
+    rectangle_vertices,
+    shared_description,
+    shared_layer,
+    shared_rotation,
 )
 from entities.component import (
     Clock,
@@ -75,7 +84,6 @@ from entities.package import (
     AssemblyType,
     AutoRotate,
     ComponentSide,
-    CopperClearance,
     DrillDiameter,
     Footprint,
     Footprint3DModel,
@@ -96,6 +104,8 @@ from entities.package import (
     StopMaskConfig,
     StrokeText,
     StrokeWidth,
+    shared_copper_clearance,
+    shared_stop_mask,
 )
 from entities.symbol import NameAlign, NameHeight, NamePosition, NameRotation, Symbol
 from entities.symbol import Pin as SymbolPin
@@ -110,6 +120,9 @@ pkg_text_height = 1.0
 sym_text_height = 2.54
 courtyard_offset = 0.5  # Rather large because packages are generic (i.e. not exact)
 
+# Use the same creation timestamp for all elements generated in one run
+timestamp = now()
+
 
 KIND_HEADER = 'pinheader'
 KIND_SOCKET = 'pinsocket'
@@ -136,12 +149,15 @@ def uuid(category: str, kind: str, variant: str, identifier: str) -> str:
         identifier:
             For example 'pad-1' or 'pin-13'.
     """
-    key = '{}-{}-{}-{}'.format(category, kind, variant, identifier).lower().replace(' ', '~')
-    if key not in uuid_cache:
-        uuid_cache[key] = str(uuid4())
-    return uuid_cache[key]
+    key = f'{category}-{kind}-{variant}-{identifier}'.lower().replace(' ', '~')
+    try:
+        return uuid_cache[key]
+    except KeyError:
+        value = uuid_cache[key] = new_uuid()
+        return value
 
 
+@lru_cache(maxsize=None)
 def get_y(pin_number: int, pin_count: int, rows: int, spacing: float, grid_align: bool) -> float:
     """
     Return the y coordinate of the specified pin. Keep the pins grid aligned, if desired.
@@ -204,194 +220,226 @@ def generate_pkg(
     version: str,
     create_date: Optional[str],
 ) -> None:
-    category = 'pkg'
     assert rows in [1, 2]
-    for i in range(min_pads, max_pads + 1, rows):
-        for drill in pad_drills:
-            per_row = i // rows
-            top_offset = spacing / 2
+    generate = partial(
+        _generate_pkg_variant,
+        library=library,
+        author=author,
+        name=name,
+        name_lower=name_lower,
+        kind=kind,
+        assembly_type=assembly_type,
+        pkgcat=pkgcat,
+        keywords=keywords,
+        rows=rows,
+        generate_silkscreen=generate_silkscreen,
+        generate_3d_model=generate_3d_model,
+        generate_3d_models=generate_3d_models,
+        version=version,
+        create_date=create_date,
+    )
+    variants = [(i, drill) for i in range(min_pads, max_pads + 1, rows) for drill in pad_drills]
+    generate_all(generate, variants, uuid_cache_file, uuid_cache, parallel=generate_3d_models)
 
-            variant = f'{rows}x{per_row}-D{drill:.1f}'
 
-            def _uuid(identifier: str) -> str:
-                return uuid(category, kind, variant, identifier)
+def _generate_pkg_variant(
+    i: int,
+    drill: float,
+    library: str,
+    author: str,
+    name: str,
+    name_lower: str,
+    kind: str,
+    assembly_type: AssemblyType,
+    pkgcat: str,
+    keywords: str,
+    rows: int,
+    generate_silkscreen: Callable[[str, str, str, int, int], Polygon],
+    generate_3d_model: Optional[Callable[[str, str, str, str, int, int, float], None]],
+    generate_3d_models: bool,
+    version: str,
+    create_date: Optional[str],
+) -> Tuple[str, Dict[str, str]]:
+    """
+    Generate and write the package with `i` pads and the specified drill
+    diameter.
 
-            uuid_pkg = _uuid('pkg')
-            uuid_pads = [_uuid('pad-{}'.format(p)) for p in range(i)]
-            uuid_footprint = _uuid('footprint-default')
-            uuid_outline = _uuid('polygon-outline')
-            uuid_courtyard = _uuid('polygon-courtyard')
-            uuid_text_name = _uuid('text-name')
-            uuid_text_value = _uuid('text-value')
-
-            full_name = f'{name} {rows}x{per_row:02d} ⌀{drill:.1f}mm'
-            full_description = (
-                f'A generic {rows}x{per_row} {name_lower} '
-                + f'with {spacing}mm pin spacing and {drill:.1f}mm drill holes.'
-                f'\n\nGenerated with {generator}'
-            )
+    May be run in a worker process, returns the package UUID and the UUID
+    cache entries which were added while generating the package.
+    """
+    category = 'pkg'
+    cache_size = len(uuid_cache)
+    per_row = i // rows
+    top_offset = spacing / 2
+
+    variant = f'{rows}x{per_row}-D{drill:.1f}'
+
+    def _uuid(identifier: str) -> str:
+        return uuid(category, kind, variant, identifier)
+
+    uuid_pkg = _uuid('pkg')
+    uuid_pads = [_uuid('pad-{}'.format(p)) for p in range(i)]
+    uuid_footprint = _uuid('footprint-default')
+    uuid_outline = _uuid('polygon-outline')
+    uuid_courtyard = _uuid('polygon-courtyard')
+    uuid_text_name = _uuid('text-name')
+    uuid_text_value = _uuid('text-value')
+
+    full_name = f'{name} {rows}x{per_row:02d} ⌀{drill:.1f}mm'
+    full_description = (
+        f'A generic {rows}x{per_row} {name_lower} '
+        + f'with {spacing}mm pin spacing and {drill:.1f}mm drill holes.'
+        f'\n\nGenerated with {generator}'
+    )
 
-            # Define package
-            package = Package(
-                uuid=uuid_pkg,
-                name=Name(full_name),
-                description=Description(full_description),
-                keywords=Keywords(f'connector, {rows}x{per_row}, d{drill:.1f}, {keywords}'),
-                author=Author(author),
-                version=Version(version),
-                created=Created(create_date or now()),
-                deprecated=Deprecated(False),
-                generated_by=GeneratedBy(''),
-                categories=[Category(pkgcat)],
-                assembly_type=assembly_type,
-            )
+    # Define package
+    package = Package(
+        uuid=uuid_pkg,
+        name=Name(full_name),
+        description=Description(full_description),
+        keywords=Keywords(f'connector, {rows}x{per_row}, d{drill:.1f}, {keywords}'),
+        author=Author(author),
+        version=Version(version),
+        created=Created(create_date or timestamp),
+        deprecated=Deprecated(False),
+        generated_by=GeneratedBy(''),
+        categories=[Category(pkgcat)],
+        assembly_type=assembly_type,
+    )
 
-            # Add pads to package
-            for j in range(1, i + 1):
-                package.add_pad(PackagePad(uuid_pads[j - 1], Name(str(j))))
-
-            # Add footprint
-            footprint = Footprint(
-                uuid=uuid_footprint,
-                name=Name('default'),
-                description=Description(''),
-                position_3d=Position3D.zero(),
-                rotation_3d=Rotation3D.zero(),
-            )
-            package.add_footprint(footprint)
+    # Add pads to package
+    for j, pad_uuid in enumerate(uuid_pads, start=1):
+        package.add_pad(PackagePad(pad_uuid, Name(str(j))))
+
+    # Add footprint
+    footprint = Footprint(
+        uuid=uuid_footprint,
+        name=Name('default'),
+        description=shared_description(''),
+        position_3d=Position3D.zero(),
+        rotation_3d=Rotation3D.zero(),
+    )
+    package.add_footprint(footprint)
 
-            # Add pads to footprint
-            for p in range(1, i + 1):
-                pad_uuid = uuid_pads[p - 1]
-                if rows == 1:
-                    x = 0.0
-                elif rows == 2:
-                    x = spacing / 2 if (p % rows == 0) else -spacing / 2
-                y = get_y(p, i, rows, spacing, False)
-                corner_radius = 0.0 if p == 1 else 1.0
-                footprint.add_pad(
-                    FootprintPad(
-                        uuid=pad_uuid,
-                        side=ComponentSide.TOP,
-                        shape=Shape.ROUNDED_RECT,
-                        position=Position(x, y),
-                        rotation=Rotation(0),
-                        size=Size(pad_size[0], pad_size[1]),
-                        radius=ShapeRadius(corner_radius),
-                        stop_mask=StopMaskConfig(StopMaskConfig.AUTO),
-                        solder_paste=SolderPasteConfig.OFF,
-                        copper_clearance=CopperClearance(0.0),
-                        function=PadFunction.STANDARD_PAD,
-                        package_pad=PackagePadUuid(pad_uuid),
-                        holes=[
-                            PadHole(
-                                pad_uuid,
-                                DrillDiameter(drill),
-                                [Vertex(Position(0.0, 0.0), Angle(0.0))],
-                            )
-                        ],
+    # Add pads to footprint
+    for p, pad_uuid in enumerate(uuid_pads, start=1):
+        if rows == 1:
+            x = 0.0
+        elif rows == 2:
+            x = spacing / 2 if (p % rows == 0) else -spacing / 2
+        y = get_y(p, i, rows, spacing, False)
+        corner_radius = 0.0 if p == 1 else 1.0
+        footprint.add_pad(
+            FootprintPad(
+                uuid=pad_uuid,
+                side=ComponentSide.TOP,
+                shape=Shape.ROUNDED_RECT,
+                position=Position(x, y),
+                rotation=shared_rotation(0.0),
+                size=Size(pad_size[0], pad_size[1]),
+                radius=ShapeRadius(corner_radius),
+                stop_mask=shared_stop_mask(StopMaskConfig.AUTO),
+                solder_paste=SolderPasteConfig.OFF,
+                copper_clearance=shared_copper_clearance(0.0),
+                function=PadFunction.STANDARD_PAD,
+                package_pad=PackagePadUuid(pad_uuid),
+                holes=[
+                    PadHole(
+                        pad_uuid,
+                        DrillDiameter(drill),
+                        [Vertex(Position(0.0, 0.0), Angle(0.0))],
                     )
-                )
-
-            # Add silkscreen to footprint
-            silkscreen = generate_silkscreen(category, kind, variant, i, rows)
-            footprint.add_polygon(silkscreen)
-
-            # Package outline
-            dx = (width + (rows - 1) * spacing) / 2
-            dy = (width + (per_row - 1) * spacing) / 2
-            footprint.add_polygon(
-                Polygon(
-                    uuid=uuid_outline,
-                    layer=Layer('top_package_outlines'),
-                    width=Width(0),
-                    fill=Fill(False),
-                    grab_area=GrabArea(False),
-                    vertices=[
-                        Vertex(Position(-dx, dy), Angle(0)),
-                        Vertex(Position(dx, dy), Angle(0)),
-                        Vertex(Position(dx, -dy), Angle(0)),
-                        Vertex(Position(-dx, -dy), Angle(0)),
-                    ],
-                )
+                ],
             )
+        )
 
-            # Courtyard
-            dx += courtyard_offset
-            dy += courtyard_offset
-            footprint.add_polygon(
-                Polygon(
-                    uuid=uuid_courtyard,
-                    layer=Layer('top_courtyard'),
-                    width=Width(0),
-                    fill=Fill(False),
-                    grab_area=GrabArea(False),
-                    vertices=[
-                        Vertex(Position(-dx, dy), Angle(0)),
-                        Vertex(Position(dx, dy), Angle(0)),
-                        Vertex(Position(dx, -dy), Angle(0)),
-                        Vertex(Position(-dx, -dy), Angle(0)),
-                    ],
-                )
-            )
+    # Add silkscreen to footprint
+    silkscreen = generate_silkscreen(category, kind, variant, i, rows)
+    footprint.add_polygon(silkscreen)
+
+    # Package outline
+    dx = (width + (rows - 1) * spacing) / 2
+    dy = (width + (per_row - 1) * spacing) / 2
+    footprint.add_polygon(
+        Polygon(
+            uuid=uuid_outline,
+            layer=shared_layer('top_package_outlines'),
+            width=Width(0),
+            fill=Fill(False),
+            grab_area=GrabArea(False),
+            vertices=rectangle_vertices(-dx, dy, dx, -dy, closed=False),
+        )
+    )
 
-            # Labels
-            y_max, y_min = get_rectangle_bounds(i, rows, spacing, top_offset + 1.27, False)
-            footprint.add_text(
-                StrokeText(
-                    uuid=uuid_text_name,
-                    layer=Layer('top_names'),
-                    height=Height(pkg_text_height),
-                    stroke_width=StrokeWidth(0.2),
-                    letter_spacing=LetterSpacing.AUTO,
-                    line_spacing=LineSpacing.AUTO,
-                    align=Align('center bottom'),
-                    position=Position(0.0, y_max),
-                    rotation=Rotation(0.0),
-                    auto_rotate=AutoRotate(True),
-                    mirror=Mirror(False),
-                    value=Value('{{NAME}}'),
-                )
-            )
-            footprint.add_text(
-                StrokeText(
-                    uuid=uuid_text_value,
-                    layer=Layer('top_values'),
-                    height=Height(pkg_text_height),
-                    stroke_width=StrokeWidth(0.2),
-                    letter_spacing=LetterSpacing.AUTO,
-                    line_spacing=LineSpacing.AUTO,
-                    align=Align('center top'),
-                    position=Position(0.0, y_min),
-                    rotation=Rotation(0.0),
-                    auto_rotate=AutoRotate(True),
-                    mirror=Mirror(False),
-                    value=Value('{{VALUE}}'),
-                )
-            )
+    # Courtyard
+    dx += courtyard_offset
+    dy += courtyard_offset
+    footprint.add_polygon(
+        Polygon(
+            uuid=uuid_courtyard,
+            layer=shared_layer('top_courtyard'),
+            width=Width(0),
+            fill=Fill(False),
+            grab_area=GrabArea(False),
+            vertices=rectangle_vertices(-dx, dy, dx, -dy, closed=False),
+        )
+    )
 
-            # Generate 3D models (for some packages)
-            if generate_3d_model is not None:
-                uuid_3d = _uuid('3d')
-                if generate_3d_models:
-                    generate_3d_model(library, full_name, uuid_pkg, uuid_3d, rows, i, drill)
-                package.add_3d_model(Package3DModel(uuid_3d, Name(full_name)))
-                for footprint in package.footprints:
-                    footprint.add_3d_model(Footprint3DModel(uuid_3d))
+    # Labels
+    y_max, y_min = get_rectangle_bounds(i, rows, spacing, top_offset + 1.27, False)
+    footprint.add_text(
+        StrokeText(
+            uuid=uuid_text_name,
+            layer=shared_layer('top_names'),
+            height=Height(pkg_text_height),
+            stroke_width=StrokeWidth(0.2),
+            letter_spacing=LetterSpacing.AUTO,
+            line_spacing=LineSpacing.AUTO,
+            align=Align('center bottom'),
+            position=Position(0.0, y_max),
+            rotation=shared_rotation(0.0),
+            auto_rotate=AutoRotate(True),
+            mirror=Mirror(False),
+            value=Value('{{NAME}}'),
+        )
+    )
+    footprint.add_text(
+        StrokeText(
+            uuid=uuid_text_value,
+            layer=shared_layer('top_values'),
+            height=Height(pkg_text_height),
+            stroke_width=StrokeWidth(0.2),
+            letter_spacing=LetterSpacing.AUTO,
+            line_spacing=LineSpacing.AUTO,
+            align=Align('center top'),
+            position=Position(0.0, y_min),
+            rotation=shared_rotation(0.0),
+            auto_rotate=AutoRotate(True),
+            mirror=Mirror(False),
+            value=Value('{{VALUE}}'),
+        )
+    )
 
-            # Message approvals
-            if assembly_type == AssemblyType.NONE:
-                # Assembly type is reported as suspicious because there are
-                # some pads, but this is intended for soldered wire connectors.
-                package.add_approval('(approved suspicious_assembly_type)')
+    # Generate 3D models (for some packages)
+    if generate_3d_model is not None:
+        uuid_3d = _uuid('3d')
+        if generate_3d_models:
+            generate_3d_model(library, full_name, uuid_pkg, uuid_3d, rows, i, drill)
+        package.add_3d_model(Package3DModel(uuid_3d, Name(full_name)))
+        for footprint in package.footprints:
+            footprint.add_3d_model(Footprint3DModel(uuid_3d))
 
-            package.serialize(path.join('out', library, category))
+    # Message approvals
+    if assembly_type == AssemblyType.NONE:
+        # Assembly type is reported as suspicious because there are
+        # some pads, but this is intended for soldered wire connectors.
+        package.add_approval('(approved suspicious_assembly_type)')
 
-            print(
-                '{}x{:02d} {} ⌀{:.1f}mm: Wrote package {}'.format(
-                    rows, per_row, kind, drill, uuid_pkg
-                )
-            )
+    package.serialize(path.join('out', library, category))
+
+    print('{}x{:02d} {} ⌀{:.1f}mm: Wrote package {}'.format(rows, per_row, kind, drill, uuid_pkg))
+
+    return uuid_pkg, new_cache_entries(uuid_cache, cache_size)
 
 
 def generate_silkscreen_female(
@@ -410,17 +458,11 @@ def generate_silkscreen_female(
 
     return Polygon(
         uuid=uuid_polygon,
-        layer=Layer('top_legend'),
+        layer=shared_layer('top_legend'),
         width=Width(line_width),
         fill=Fill(False),
         grab_area=GrabArea(True),
-        vertices=[
-            Vertex(Position(-x, y_max), Angle(0)),
-            Vertex(Position(x, y_max), Angle(0)),
-            Vertex(Position(x, y_min), Angle(0)),
-            Vertex(Position(-x, y_min), Angle(0)),
-            Vertex(Position(-x, y_max), Angle(0)),
-        ],
+        vertices=rectangle_vertices(-x, y_max, x, y_min),
     )
 
 
@@ -440,7 +482,7 @@ def generate_silkscreen_male(
 
     polygon = Polygon(
         uuid=uuid_polygon,
-        layer=Layer('top_legend'),
+        layer=shared_layer('top_legend'),
         width=Width(line_width),
         fill=Fill(False),
         grab_area=GrabArea(True),
@@ -598,19 +640,21 @@ def generate_sym(
             Keywords('connector, {}x{}, {}'.format(rows, per_row, keywords)),
             Author(author),
             Version(version),
-            Created(create_date or now()),
+            Created(create_date or timestamp),
             Deprecated(False),
             GeneratedBy(''),
             [Category(cmpcat)],
         )
 
-        for p in range(1, i + 1):
+        pin_ys = [get_y(p, i, rows, spacing, True) for p in range(1, i + 1)]
+
+        for p, (pin_uuid, pin_y) in enumerate(zip(uuid_pins, pin_ys), start=1):
             x_sign = 1 if (p % rows == 0) else -1
             pin = SymbolPin(
-                uuid_pins[p - 1],
+                pin_uuid,
                 Name(str(p)),
-                Position((w + 2.54) * x_sign, get_y(p, i, rows, spacing, True)),
-                Rotation(180.0 if p % rows == 0 else 0),
+                Position((w + 2.54) * x_sign, pin_y),
+                shared_rotation(180.0 if p % rows == 0 else 0),
                 Length(2.54 + pin_length_inside),
                 NamePosition(pin_name_offset, 0.0),
                 NameRotation(0.0),
@@ -622,13 +666,13 @@ def generate_sym(
         # Polygons
         y_max, y_min = get_rectangle_bounds(i, rows, spacing, spacing, True)
         polygon = Polygon(
-            uuid_polygon, Layer('sym_outlines'), Width(line_width), Fill(False), GrabArea(True)
+            uuid_polygon,
+            shared_layer('sym_outlines'),
+            Width(line_width),
+            Fill(False),
+            GrabArea(True),
+            rectangle_vertices(-w, y_max, w, y_min),
         )
-        polygon.add_vertex(Vertex(Position(-w, y_max), Angle(0.0)))
-        polygon.add_vertex(Vertex(Position(w, y_max), Angle(0.0)))
-        polygon.add_vertex(Vertex(Position(w, y_min), Angle(0.0)))
-        polygon.add_vertex(Vertex(Position(-w, y_min), Angle(0.0)))
-        polygon.add_vertex(Vertex(Position(-w, y_max), Angle(0.0)))
         symbol.add_polygon(polygon)
 
         # Decorations
@@ -636,33 +680,29 @@ def generate_sym(
             # Headers: Small rectangle
             for p in range(1, i + 1):
                 x_sign = 1 if (p % rows == 0) else -1
-                y = get_y(p, i, rows, spacing, True)
+                y = pin_ys[p - 1]
                 dx = spacing / 8 * 1.5 * x_sign
                 dy = spacing / 8 / 1.5
                 x_offset = x_sign * (w - 1.27)
                 polygon = Polygon(
                     uuid_decoration,
-                    Layer('sym_outlines'),
+                    shared_layer('sym_outlines'),
                     Width(line_width),
                     Fill(True),
                     GrabArea(True),
+                    rectangle_vertices(x_offset - dx, y + dy, x_offset + dx, y - dy),
                 )
-                polygon.add_vertex(Vertex(Position(x_offset - dx, y + dy), Angle(0.0)))
-                polygon.add_vertex(Vertex(Position(x_offset + dx, y + dy), Angle(0.0)))
-                polygon.add_vertex(Vertex(Position(x_offset + dx, y - dy), Angle(0.0)))
-                polygon.add_vertex(Vertex(Position(x_offset - dx, y - dy), Angle(0.0)))
-                polygon.add_vertex(Vertex(Position(x_offset - dx, y + dy), Angle(0.0)))
                 symbol.add_polygon(polygon)
         elif kind == KIND_SOCKET:
             # Sockets: Small semicircle
             for p in range(1, i + 1):
                 x_sign = 1 if (p % rows == 0) else -1
-                y = get_y(p, i, rows, spacing, True)
+                y = pin_ys[p - 1]
                 dy = spacing / 4 * 0.75
                 x_offset = x_sign * (w - 1.27 - dy * 0.75)
                 polygon = Polygon(
                     uuid_decoration,
-                    Layer('sym_outlines'),
+                    shared_layer('sym_outlines'),
                     Width(line_width * 0.75),
                     Fill(False),
                     GrabArea(False),
@@ -673,7 +713,7 @@ def generate_sym(
         elif kind == KIND_SCREW_TERMINAL:
             # Screw terminals: Screw circle
             for p in range(1, i + 1):
-                y = get_y(p, i, rows, spacing, True)
+                y = pin_ys[p - 1]
                 dy = spacing / 4 * 0.75
                 diam = 1.6
                 x_offset = w - (diam / 2) - pin_length_inside
@@ -681,7 +721,7 @@ def generate_sym(
                 symbol.add_circle(
                     Circle(
                         uuid_decoration,
-                        Layer('sym_outlines'),
+                        shared_layer('sym_outlines'),
                         Width(line_width * 0.75),
                         Fill(False),
                         GrabArea(False),
@@ -693,7 +733,7 @@ def generate_sym(
                 line_dy = (diam / 2) * math.sin(math.pi / 4 - math.pi / 16)
                 line1 = Polygon(
                     uuid_decoration_2,
-                    Layer('sym_outlines'),
+                    shared_layer('sym_outlines'),
                     Width(line_width * 0.5),
                     Fill(False),
                     GrabArea(False),
@@ -703,7 +743,7 @@ def generate_sym(
                 symbol.add_polygon(line1)
                 line2 = Polygon(
                     uuid_decoration_3,
-                    Layer('sym_outlines'),
+                    shared_layer('sym_outlines'),
                     Width(line_width * 0.5),
                     Fill(False),
                     GrabArea(False),
@@ -716,23 +756,23 @@ def generate_sym(
         y_max, y_min = get_rectangle_bounds(i, rows, spacing, spacing, True)
         text = Text(
             uuid_text_name,
-            Layer('sym_names'),
+            shared_layer('sym_names'),
             Value('{{NAME}}'),
             Align('center bottom'),
             Height(sym_text_height),
             Position(0.0, y_max),
-            Rotation(0.0),
+            shared_rotation(0.0),
         )
         symbol.add_text(text)
 
         text = Text(
             uuid_text_value,
-            Layer('sym_values'),
+            shared_layer('sym_values'),
             Value('{{VALUE}}'),
             Align('center top'),
             Height(sym_text_height),
             Position(0.0, y_min),
-            Rotation(0.0),
+            shared_rotation(0.0),
         )
         symbol.add_text(text)
 
@@ -781,7 +821,7 @@ def generate_cmp(
             Keywords('connector, {}x{}, {}'.format(rows, per_row, keywords)),
             Author(author),
             Version(version),
-            Created(create_date or now()),
+            Created(create_date or timestamp),
             Deprecated(False),
             GeneratedBy(''),
             [Category(cmpcat)],
@@ -790,10 +830,10 @@ def generate_cmp(
             Prefix('J'),
         )
 
-        for p in range(1, i + 1):
+        for p, signal_uuid in enumerate(uuid_signals, start=1):
             component.add_signal(
                 Signal(
-                    uuid_signals[p - 1],
+                    signal_uuid,
                     Name(str(p)),
                     Role.PASSIVE,
                     Required(False),
@@ -807,21 +847,21 @@ def generate_cmp(
             uuid_gate,
             SymbolUUID(uuid_symbol),
             Position(0.0, 0.0),
-            Rotation(0.0),
+            shared_rotation(0.0),
             Required(True),
             Suffix(''),
         )
-        for p in range(1, i + 1):
+        for pin_uuid, signal_uuid in zip(uuid_pins, uuid_signals):
             gate.add_pin_signal_map(
                 PinSignalMap(
-                    uuid_pins[p - 1],
-                    SignalUUID(uuid_signals[p - 1]),
+                    pin_uuid,
+                    SignalUUID(signal_uuid),
                     TextDesignator.SYMBOL_PIN_NAME,
                 )
             )
 
         component.add_variant(
-            Variant(uuid_variant, Norm.EMPTY, Name('default'), Description(''), gate)
+            Variant(uuid_variant, Norm.EMPTY, Name('default'), shared_description(''), gate)
         )
 
         # Message approvals
@@ -852,8 +892,6 @@ def generate_dev(
     for i in range(min_pads, max_pads + 1, rows):
         per_row = i // rows
         for drill in pad_drills:
-            lines = []
-
             variant = '{}x{}-D{:.1f}'.format(rows, per_row, drill)
             broad_variant = '{}x{}'.format(rows, per_row)
 
@@ -868,42 +906,34 @@ def generate_dev(
             uuid_pkg = uuid('pkg', kind, variant, 'pkg')
             uuid_pads = [uuid('pkg', kind, variant, 'pad-{}'.format(p)) for p in range(i)]
 
-            # General info
-            lines.append('(librepcb_device {}'.format(uuid_dev))
-            lines.append(' (name "{} {}x{:02d} ⌀{:.1f}mm")'.format(name, rows, per_row, drill))
-            lines.append(
-                ' (description "A {}x{} {} with {}mm pin spacing '
-                'and {:.1f}mm drill holes.\\n\\n'
-                'Generated with {}")'.format(rows, per_row, name_lower, spacing, drill, generator)
+            # Pad to signal mappings, sorted by pad UUID
+            signalmappings = sorted(
+                f' (pad {pad} (signal {signal}))' for pad, signal in zip(uuid_pads, uuid_signals)
             )
-            lines.append(
-                ' (keywords "connector, {}x{}, d{:.1f}, {}")'.format(rows, per_row, drill, keywords)
+
+            content = (
+                f'(librepcb_device {uuid_dev}\n'
+                f' (name "{name} {rows}x{per_row:02d} ⌀{drill:.1f}mm")\n'
+                f' (description "A {rows}x{per_row} {name_lower} with {spacing}mm pin spacing '
+                f'and {drill:.1f}mm drill holes.\\n\\n'
+                f'Generated with {generator}")\n'
+                f' (keywords "connector, {rows}x{per_row}, d{drill:.1f}, {keywords}")\n'
+                f' (author "{author}")\n'
+                ' (version "0.1.1")\n'
+                f' (created {create_date or timestamp})\n'
+                ' (deprecated false)\n'
+                ' (generated_by "")\n'
+                f' (category {cmpcat})\n'
+                f' (component {uuid_cmp})\n'
+                f' (package {uuid_pkg})\n'
+                + '\n'.join(signalmappings)
+                + '\n (approved no_parts)\n)\n'
             )
-            lines.append(' (author "{}")'.format(author))
-            lines.append(' (version "0.1.1")')
-            lines.append(' (created {})'.format(create_date or now()))
-            lines.append(' (deprecated false)')
-            lines.append(' (generated_by "")')
-            lines.append(' (category {})'.format(cmpcat))
-            lines.append(' (component {})'.format(uuid_cmp))
-            lines.append(' (package {})'.format(uuid_pkg))
-            signalmappings = []
-            for p in range(1, i + 1):
-                signalmappings.append(
-                    ' (pad {} (signal {}))'.format(uuid_pads[p - 1], uuid_signals[p - 1])
-                )
-            lines.extend(sorted(signalmappings))
-            lines.append(' (approved no_parts)')
-            lines.append(')')
 
             dev_dir_path = path.join('out', library, category, uuid_dev)
-            if not (path.exists(dev_dir_path) and path.isdir(dev_dir_path)):
-                makedirs(dev_dir_path)
-            with open(path.join(dev_dir_path, '.librepcb-dev'), 'w') as f:
-                f.write('1\n')
-            with open(path.join(dev_dir_path, 'device.lp'), 'w') as f:
-                f.write('\n'.join(lines))
-                f.write('\n')
+            makedirs(dev_dir_path, exist_ok=True)
+            write_file_if_changed(path.join(dev_dir_path, '.librepcb-dev'), '1\n')
+            write_file_if_changed(path.join(dev_dir_path, 'device.lp'), content)
 
             print(
                 '{}x{} {} ⌀{:.1f}mm: Wrote device {}'.format(rows, per_row, kind, drill, uuid_dev)
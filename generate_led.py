@@ -3,17 +3,17 @@ Generate THT LED packages.
 """
 
 import sys
+from functools import lru_cache, partial
 from math import acos, asin, degrees, sqrt
 from os import path
 from uuid import uuid4
 
-from typing import Iterable, List, Optional, Tuple
+from typing import Dict, Iterable, List, Optional, Tuple
 
 from common import format_ipc_dimension as fd
-from common import init_cache, now, save_cache
+from common import generate_all, init_cache, new_cache_entries, now, save_cache
 from entities.common import (
     Align,
-    Angle,
     Author,
     Category,
     Circle,
@@ -26,17 +26,21 @@ from entities.common import (
     GrabArea,
     Height,
     Keywords,
-    Layer,
     Name,
     Polygon,
     Position,
     Position3D,
-    Rotation,
     Rotation3D,
     Value,
     Version,
     Vertex,
     Width,
+    path_vertices,
+    rectangle_vertices,
+    shared_angle,
+    shared_description,
+    shared_layer,
+    shared_rotation,
 )
 from entities.component import SignalUUID
 from entities.device import ComponentPad, ComponentUUID, Device, PackageUUID
@@ -44,7 +48,6 @@ from entities.package import (
     AssemblyType,
     AutoRotate,
     ComponentSide,
-    CopperClearance,
     DrillDiameter,
     Footprint,
     Footprint3DModel,
@@ -65,6 +68,8 @@ from entities.package import (
     StopMaskConfig,
     StrokeText,
     StrokeWidth,
+    shared_copper_clearance,
+    shared_stop_mask,
 )
 
 GENERATOR_NAME = 'librepcb-parts-generator (generate_led.py)'
@@ -74,16 +79,37 @@ pad_drill = 0.8
 default_line_width = 0.2
 pkg_text_height = 1.0
 
+# Value objects shared by all footprints (never modified after construction)
+pad_size_default = Size(1.4, 1.4)
+pad_size_large = Size(2.5, 1.3)
+text_height = Height(pkg_text_height)
+text_align_top = Align('center top')
+text_align_bottom = Align('center bottom')
+text_stroke_width = StrokeWidth(0.2)
+text_auto_rotate = AutoRotate(True)
+text_mirror = Mirror(False)
+text_value_name = Value('{{NAME}}')
+text_value_value = Value('{{VALUE}}')
+line_width_default = Width(default_line_width)
+line_width_zero = Width(0)
+fill_true = Fill(True)
+fill_false = Fill(False)
+grab_area_false = GrabArea(False)
+
 
 # Initialize UUID cache
 uuid_cache_file = 'uuid_cache_led.csv'
 uuid_cache = init_cache(uuid_cache_file)
 
 
+@lru_cache(maxsize=None)
 def uuid(category: str, full_name: str, identifier: str) -> str:
     """
     Return a uuid for the specified pin.
 
+    Memoized, since the same UUIDs are requested by every footprint and by
+    the devices. The UUID cache stays the persistent store.
+
     Params:
         category:
             For example 'cmp' or 'pkg'.
@@ -92,13 +118,43 @@ def uuid(category: str, full_name: str, identifier: str) -> str:
         identifier:
             For example 'pad-1' or 'pin-13'.
     """
-    key = '{}-{}-{}'.format(category, full_name, identifier).lower().replace(' ', '~')
-    if key not in uuid_cache:
-        uuid_cache[key] = str(uuid4())
-    return uuid_cache[key]
+    key = f'{category}-{full_name}-{identifier}'.lower().replace(' ', '~')
+    try:
+        return uuid_cache[key]
+    except KeyError:
+        value = uuid_cache[key] = str(uuid4())
+        return value
 
 
 class LedConfig:
+    __slots__ = (
+        'top_diameter',
+        'bot_diameter',
+        'lead_spacing',
+        'body_height',
+        'standoff',
+        'standoff_in_name',
+        'body_color',
+        'body_color_rgba',
+        '_pkg_name',
+        '_pkg_description',
+        '_dev_name',
+        'top_radius',
+        'bot_radius',
+        'doc_inner_radius',
+        'doc_outer_radius',
+        'legend_inner_radius',
+        'legend_outer_radius',
+        'courtyard_offset',
+        'h_lead_x_inner',
+        'h_lead_x_outer',
+        'h_pad_legend_clearance',
+        'h_legend_x',
+        'h_body_bottom_silkscreen_x',
+        'h_legend_short_on_inner',
+        'h_legend_short_on_outer',
+    )
+
     def __init__(
         self,
         top_diameter: float,
@@ -119,38 +175,276 @@ class LedConfig:
         self.body_color = body_color
         self.body_color_rgba = body_color_rgba
 
-        self.pkg_name = 'LED-THT-P{lead_spacing}D{top_diameter}H{body_height}{standoff_option}-{body_color}'.format(
-            top_diameter=fd(top_diameter),
-            body_height=fd(body_height),
-            lead_spacing=fd(lead_spacing),
-            standoff_option=('S' + fd(standoff)) if standoff_in_name else '',
-            body_color=body_color.upper(),
+        # Names and descriptions are only formatted when first accessed
+        self._pkg_name: Optional[str] = None
+        self._pkg_description: Optional[str] = None
+        self._dev_name: Optional[str] = None
+
+        # Geometry shared by all footprints of this LED
+        self.top_radius = top_diameter / 2
+        self.bot_radius = bot_diameter / 2
+        self.doc_inner_radius = self.top_radius - default_line_width / 2
+        self.doc_outer_radius = self.bot_radius - default_line_width / 2
+        self.legend_inner_radius = self.top_radius + default_line_width / 2
+        self.legend_outer_radius = self.bot_radius + default_line_width / 2
+        self.courtyard_offset = 0.5 if bot_diameter >= 10.0 else 0.4
+
+        # The horizontal footprints only differ in the body offset, so
+        # everything else is calculated only once
+        self.h_lead_x_inner = min((lead_spacing / 2 + lead_width / 2), self.top_radius)
+        self.h_lead_x_outer = 2 * (lead_spacing / 2) - self.h_lead_x_inner
+        self.h_pad_legend_clearance = pad_size_default.width / 2 + default_line_width / 2 + 0.18
+        self.h_legend_x = lead_spacing / 2 - self.h_pad_legend_clearance
+        self.h_body_bottom_silkscreen_x = lead_spacing / 2 + self.h_pad_legend_clearance
+        self.h_legend_short_on_inner = self.h_body_bottom_silkscreen_x < self.legend_inner_radius
+        self.h_legend_short_on_outer = self.h_body_bottom_silkscreen_x < self.legend_outer_radius
+
+    @property
+    def pkg_name(self) -> str:
+        if self._pkg_name is None:
+            self._pkg_name = (
+                'LED-THT-P{lead_spacing}D{top_diameter}H{body_height}{standoff_option}-{body_color}'
+            ).format(
+                top_diameter=fd(self.top_diameter),
+                body_height=fd(self.body_height),
+                lead_spacing=fd(self.lead_spacing),
+                standoff_option=('S' + fd(self.standoff)) if self.standoff_in_name else '',
+                body_color=self.body_color.upper(),
+            )
+        return self._pkg_name
+
+    @property
+    def pkg_description(self) -> str:
+        if self._pkg_description is None:
+            self._pkg_description = (
+                'Generic through-hole LED with {top_diameter:.2f} mm'
+                ' body diameter.\n\n'
+                'Body height: {body_height:.2f} mm\n'
+                'Lead spacing: {lead_spacing:.2f} mm\n'
+                'Standoff: {standoff:.2f} mm\n'
+                'Body color: {body_color}'
+                '\n\nGenerated with {generator}'.format(
+                    top_diameter=self.top_diameter,
+                    body_height=self.body_height,
+                    lead_spacing=self.lead_spacing,
+                    standoff=self.standoff,
+                    body_color=self.body_color,
+                    generator=GENERATOR_NAME,
+                )
+            )
+        return self._pkg_description
+
+    @property
+    def dev_name(self) -> str:
+        if self._dev_name is None:
+            self._dev_name = 'LED ⌀{top_diameter}x{body_height}{standoff_option}/{lead_spacing}mm {body_color}'.format(
+                top_diameter=self.top_diameter,
+                body_height=self.body_height,
+                lead_spacing=self.lead_spacing,
+                standoff_option=('+' + str(self.standoff)) if self.standoff_in_name else '',
+                body_color=self.body_color,
+            )
+        return self._dev_name
+
+    @property
+    def dev_description(self) -> str:
+        return self.pkg_description
+
+
+@lru_cache(maxsize=None)
+def flattened_circle_geometry(
+    outer_radius: float, inner_radius: float, reduced: bool
+) -> Tuple[float, float]:
+    """
+    Return the y offset of the flat side and the angle of the circle segment
+    of a flattened circle. Memoized since all footprints of an LED share the
+    same few radii.
+    """
+    # To calculate the y offset of the flat side, use Pythagoras
+    y = sqrt(outer_radius**2 - inner_radius**2)
+
+    # Now we can calculate the angle of the circle segment
+    if reduced:
+        segment_angle = degrees(2 * asin(inner_radius / outer_radius))
+    else:
+        segment_angle = 180 - degrees(acos(inner_radius / outer_radius))
+    return y, segment_angle
+
+
+# A polygon of a horizontal footprint as (identifier, layer, width, fill, vertices)
+HorizontalPolygon = Tuple[str, str, Width, Fill, Tuple[Vertex, ...]]
+
+_horizontal_polygons: Dict[Tuple[float, ...], Tuple[HorizontalPolygon, ...]] = {}
+
+
+def horizontal_footprint_polygons(
+    config: LedConfig, body_offset: float
+) -> Tuple[HorizontalPolygon, ...]:
+    """
+    Return the polygons of a horizontal footprint, without UUIDs.
+
+    The polygons only depend on the LED dimensions and the body offset, so
+    they are calculated once and shared by all configs which only differ in
+    color or standoff.
+    """
+    key = (
+        config.top_diameter,
+        config.bot_diameter,
+        config.lead_spacing,
+        config.body_height,
+        body_offset,
+    )
+    try:
+        return _horizontal_polygons[key]
+    except KeyError:
+        pass
+
+    polygons: List[HorizontalPolygon] = []
+
+    # Documentation outline
+    inner_radius = config.doc_inner_radius
+    outer_radius = config.doc_outer_radius
+    body_bottom_y = body_offset + default_line_width / 2
+    body_middle_y = body_bottom_y + 1.0 - default_line_width
+    body_top_y = body_bottom_y + config.body_height - inner_radius - default_line_width
+    doc_vertices = path_vertices(
+        [
+            (-inner_radius, body_middle_y, 0),
+            (-inner_radius, body_top_y, -180),
+            (inner_radius, body_top_y, 0),
+            (inner_radius, body_middle_y, 0),
+            (outer_radius, body_middle_y, 0),
+            (outer_radius, body_bottom_y, 0),
+            (-inner_radius, body_bottom_y, 0),
+            (-inner_radius, body_middle_y, 0),
+            (inner_radius, body_middle_y, 0),
+        ]
+    )
+    polygons.append(
+        ('polygon-doc', 'top_documentation', line_width_default, fill_false, tuple(doc_vertices))
+    )
+
+    # Documentation leads
+    for pad, factor in [('a', 1), ('c', -1)]:
+        x0 = config.h_lead_x_inner * factor
+        x1 = config.h_lead_x_outer * factor
+        polygons.append(
+            (
+                'polygon-doc-' + pad,
+                'top_documentation',
+                line_width_zero,
+                fill_true,
+                tuple(rectangle_vertices(x0, body_offset, x1, -lead_width / 2)),
+            )
+        )
+
+    # Determine legend variant
+    body_bottom_y -= default_line_width
+    split_legend = body_bottom_y < config.h_pad_legend_clearance
+
+    # legend short
+    if split_legend:
+        legend_x = config.h_legend_x
+        polygons.append(
+            (
+                'polygon-legend2',
+                'top_legend',
+                line_width_default,
+                fill_false,
+                (
+                    Vertex(Position(-legend_x, body_bottom_y), shared_angle(0)),
+                    Vertex(Position(legend_x, body_bottom_y), shared_angle(0)),
+                ),
+            )
+        )
+
+    # legend outline
+    inner_radius = config.legend_inner_radius
+    outer_radius = config.legend_outer_radius
+    body_bottom_silkscreen_x = config.h_body_bottom_silkscreen_x
+    body_bottom_silkscreen_y = max(body_bottom_y, config.h_pad_legend_clearance)
+    body_middle_y += default_line_width
+    legend_vertices: List[Vertex] = []
+    if split_legend is False:
+        legend_vertices.append(Vertex(Position(-inner_radius, body_bottom_y), shared_angle(0)))
+    elif config.h_legend_short_on_inner:
+        legend_vertices.append(
+            Vertex(Position(-body_bottom_silkscreen_x, body_bottom_y), shared_angle(0))
+        )
+        legend_vertices.append(Vertex(Position(-inner_radius, body_bottom_y), shared_angle(0)))
+    else:
+        legend_vertices.append(
+            Vertex(Position(-inner_radius, body_bottom_silkscreen_y), shared_angle(0))
+        )
+    legend_vertices.append(Vertex(Position(-inner_radius, body_top_y), shared_angle(-180)))
+    legend_vertices.append(Vertex(Position(inner_radius, body_top_y), shared_angle(0)))
+    legend_vertices.append(Vertex(Position(inner_radius, body_middle_y), shared_angle(0)))
+    legend_vertices.append(Vertex(Position(outer_radius, body_middle_y), shared_angle(0)))
+    if split_legend is False:
+        legend_vertices.append(Vertex(Position(outer_radius, body_bottom_y), shared_angle(0)))
+        legend_vertices.append(Vertex(Position(-inner_radius, body_bottom_y), shared_angle(0)))
+    elif config.h_legend_short_on_outer:
+        legend_vertices.append(Vertex(Position(outer_radius, body_bottom_y), shared_angle(0)))
+        legend_vertices.append(
+            Vertex(Position(body_bottom_silkscreen_x, body_bottom_y), shared_angle(0))
         )
-        self.pkg_description = (
-            'Generic through-hole LED with {top_diameter:.2f} mm'
-            ' body diameter.\n\n'
-            'Body height: {body_height:.2f} mm\n'
-            'Lead spacing: {lead_spacing:.2f} mm\n'
-            'Standoff: {standoff:.2f} mm\n'
-            'Body color: {body_color}'
-            '\n\nGenerated with {generator}'.format(
-                top_diameter=top_diameter,
-                body_height=body_height,
-                lead_spacing=lead_spacing,
-                standoff=standoff,
-                body_color=body_color,
-                generator=GENERATOR_NAME,
+    else:
+        legend_vertices.append(
+            Vertex(Position(outer_radius, body_bottom_silkscreen_y), shared_angle(0))
+        )
+    polygons.append(
+        ('polygon-legend', 'top_legend', line_width_default, fill_false, tuple(legend_vertices))
+    )
+
+    # Package outline
+    def _generate_outline(offset: float = 0, pad_offset: float = 0) -> Tuple[Vertex, ...]:
+        r_inner = config.top_radius + offset
+        r_outer = config.bot_radius + offset
+        body_y_mid = body_bottom_y + 1.0 + (default_line_width / 2) + offset
+        body_y_bot = body_offset - offset
+        leads_x = min(config.lead_spacing / 2 + lead_width / 2 + offset + pad_offset, r_inner)
+        leads_y = -lead_width / 2 - offset - pad_offset
+        return tuple(
+            path_vertices(
+                [
+                    (-r_inner, body_y_bot, 0),
+                    (-r_inner, body_top_y, -180),
+                    (r_inner, body_top_y, 0),
+                    (r_inner, body_y_mid, 0),
+                    (r_outer, body_y_mid, 0),
+                    (r_outer, body_y_bot, 0),
+                    (leads_x, body_y_bot, 0),
+                    (leads_x, leads_y, 0),
+                    (-leads_x, leads_y, 0),
+                    (-leads_x, body_y_bot, 0),
+                ]
             )
         )
 
-        self.dev_name = 'LED ⌀{top_diameter}x{body_height}{standoff_option}/{lead_spacing}mm {body_color}'.format(
-            top_diameter=top_diameter,
-            body_height=body_height,
-            lead_spacing=lead_spacing,
-            standoff_option=('+' + str(standoff)) if standoff_in_name else '',
-            body_color=body_color,
+    polygons.append(
+        (
+            'polygon-outline',
+            'top_package_outlines',
+            line_width_zero,
+            fill_false,
+            _generate_outline(),
         )
-        self.dev_description = self.pkg_description
+    )
+
+    # Courtyard
+    polygons.append(
+        (
+            'polygon-courtyard',
+            'top_courtyard',
+            line_width_zero,
+            fill_false,
+            _generate_outline(config.courtyard_offset, 0.1),
+        )
+    )
+
+    result = tuple(polygons)
+    _horizontal_polygons[key] = result
+    return result
 
 
 def generate_pkg(
@@ -163,519 +457,416 @@ def generate_pkg(
     create_date: Optional[str],
     generate_3d_models: bool,
 ) -> None:
-    category = 'pkg'
-    for config in configs:
-        is_small = config.top_diameter < 5  # Small LEDs need adjusted footprints
-        generated_3d_uuids = set()
+    # Generate all packages before serializing any of them, so a failing
+    # config doesn't leave only some of the package files updated. Note that
+    # 3D models are still written during generation.
+    generate = partial(
+        _generate_pkg,
+        library=library,
+        author=author,
+        pkgcat=pkgcat,
+        keywords=keywords,
+        version=version,
+        create_date=create_date,
+        generate_3d_models=generate_3d_models,
+    )
+    packages = generate_all(
+        generate,
+        [(config,) for config in configs],
+        uuid_cache_file,
+        uuid_cache,
+        parallel=generate_3d_models,
+    )
+
+    output_directory = path.join('out', library, 'pkg')
+    for package in packages:
+        package.serialize(output_directory)
 
-        def _uuid(identifier: str) -> str:
-            return uuid(category, config.pkg_name, identifier)
 
-        uuid_pkg = _uuid('pkg')
+def _generate_pkg(
+    config: LedConfig,
+    library: str,
+    author: str,
+    pkgcat: str,
+    keywords: str,
+    version: str,
+    create_date: Optional[str],
+    generate_3d_models: bool,
+) -> Tuple[Package, Dict[str, str]]:
+    """
+    Generate the package of a single LED config.
 
-        print('Generating {}: {}'.format(config.pkg_name, uuid_pkg))
+    Returns the package and the UUID cache entries added meanwhile.
+    """
+    category = 'pkg'
+    cache_size = len(uuid_cache)
+    is_small = config.top_diameter < 5  # Small LEDs need adjusted footprints
+    generated_3d_uuids = set()
+
+    _uuid = partial(uuid, category, config.pkg_name)
+
+    uuid_pkg = _uuid('pkg')
+
+    print('Generating {}: {}'.format(config.pkg_name, uuid_pkg))
+
+    # Package
+    package = Package(
+        uuid=uuid_pkg,
+        name=Name(config.pkg_name),
+        description=Description(config.pkg_description),
+        keywords=Keywords(keywords),
+        author=Author(author),
+        version=Version(version),
+        created=Created(create_date or now()),
+        deprecated=Deprecated(False),
+        generated_by=GeneratedBy(''),
+        categories=[Category(pkgcat)],
+        assembly_type=AssemblyType.THT,
+    )
 
-        # Package
-        package = Package(
-            uuid=uuid_pkg,
-            name=Name(config.pkg_name),
-            description=Description(config.pkg_description),
-            keywords=Keywords(keywords),
-            author=Author(author),
-            version=Version(version),
-            created=Created(create_date or now()),
-            deprecated=Deprecated(False),
-            generated_by=GeneratedBy(''),
-            categories=[Category(pkgcat)],
-            assembly_type=AssemblyType.THT,
+    # Package pads
+    package.add_pad(PackagePad(uuid=_uuid('pad-a'), name=Name('A')))
+    package.add_pad(PackagePad(uuid=_uuid('pad-c'), name=Name('C')))
+
+    # Footprint
+    def _add_footprint(
+        package: Package,
+        name: str,
+        identifier_suffix: str,
+        identifier_3d: str,
+        pad_size: Size,
+        vertical: bool,
+        horizontal_offset: float,
+    ) -> Footprint:
+        footprint = Footprint(
+            uuid=_uuid('footprint' + identifier_suffix),
+            name=Name(name),
+            description=shared_description(''),
+            position_3d=Position3D.zero(),
+            rotation_3d=Rotation3D.zero(),
         )
-
-        # Package pads
-        package.add_pad(PackagePad(uuid=_uuid('pad-a'), name=Name('A')))
-        package.add_pad(PackagePad(uuid=_uuid('pad-c'), name=Name('C')))
-
-        # Footprint
-        def _add_footprint(
-            package: Package,
-            name: str,
-            identifier_suffix: str,
-            identifier_3d: str,
-            pad_size: Size,
-            vertical: bool,
-            horizontal_offset: float,
-        ) -> Footprint:
-            footprint = Footprint(
-                uuid=_uuid('footprint' + identifier_suffix),
-                name=Name(name),
-                description=Description(''),
-                position_3d=Position3D.zero(),
-                rotation_3d=Rotation3D.zero(),
+        package.add_footprint(footprint)
+
+        # Footprint pads
+        for pad, factor in [('a', 1), ('c', -1)]:
+            pad_uuid = _uuid('pad-{}'.format(pad))
+            footprint.add_pad(
+                FootprintPad(
+                    uuid=pad_uuid,
+                    side=ComponentSide.TOP,
+                    shape=Shape.ROUNDED_RECT,
+                    position=Position(config.lead_spacing / 2 * factor, 0),
+                    rotation=shared_rotation(90),
+                    size=pad_size,
+                    radius=ShapeRadius(0.0 if pad == 'c' else 1.0),
+                    stop_mask=shared_stop_mask(StopMaskConfig.AUTO),
+                    solder_paste=SolderPasteConfig.OFF,
+                    copper_clearance=shared_copper_clearance(0.0),
+                    function=PadFunction.STANDARD_PAD,
+                    package_pad=PackagePadUuid(pad_uuid),
+                    holes=[
+                        PadHole(
+                            pad_uuid,
+                            DrillDiameter(pad_drill),
+                            [Vertex(Position(0.0, 0.0), shared_angle(0.0))],
+                        )
+                    ],
+                )
             )
-            package.add_footprint(footprint)
-
-            # Footprint pads
-            for pad, factor in [('a', 1), ('c', -1)]:
-                pad_uuid = _uuid('pad-{}'.format(pad))
-                footprint.add_pad(
-                    FootprintPad(
-                        uuid=pad_uuid,
-                        side=ComponentSide.TOP,
-                        shape=Shape.ROUNDED_RECT,
-                        position=Position(config.lead_spacing / 2 * factor, 0),
-                        rotation=Rotation(90),
-                        size=pad_size,
-                        radius=ShapeRadius(0.0 if pad == 'c' else 1.0),
-                        stop_mask=StopMaskConfig(StopMaskConfig.AUTO),
-                        solder_paste=SolderPasteConfig.OFF,
-                        copper_clearance=CopperClearance(0.0),
-                        function=PadFunction.STANDARD_PAD,
-                        package_pad=PackagePadUuid(pad_uuid),
-                        holes=[
-                            PadHole(
-                                pad_uuid,
-                                DrillDiameter(pad_drill),
-                                [Vertex(Position(0.0, 0.0), Angle(0.0))],
-                            )
-                        ],
-                    )
+
+        # 3D model
+        uuid_3d = _uuid(identifier_3d + '-3d')
+        name_3d = name
+        # Note: Some 3D models are used by multiple footprints but they shall
+        # be added to the package only once, thus we keep a list of which
+        # models were already added.
+        if uuid_3d not in generated_3d_uuids:
+            if generate_3d_models:
+                generate_3d(
+                    library, name_3d, uuid_pkg, uuid_3d, config, vertical, horizontal_offset
                 )
+            package.add_3d_model(Package3DModel(uuid_3d, Name(name_3d)))
+            generated_3d_uuids.add(uuid_3d)
+        footprint.add_3d_model(Footprint3DModel(uuid_3d))
+
+        return footprint
+
+    def _add_vertical_footprint(
+        package: Package,
+        name: str,
+        identifier_suffix: str,
+        identifier_3d: str,
+        pad_size: Size,
+    ) -> None:
+        footprint = _add_footprint(
+            package=package,
+            identifier_suffix=identifier_suffix,
+            identifier_3d=identifier_3d,
+            name=name,
+            pad_size=pad_size,
+            vertical=True,
+            horizontal_offset=0,
+        )
 
-            # 3D model
-            uuid_3d = _uuid(identifier_3d + '-3d')
-            name_3d = name
-            # Note: Some 3D models are used by multiple footprints but they shall
-            # be added to the package only once, thus we keep a list of which
-            # models were already added.
-            if uuid_3d not in generated_3d_uuids:
-                if generate_3d_models:
-                    generate_3d(
-                        library, name_3d, uuid_pkg, uuid_3d, config, vertical, horizontal_offset
-                    )
-                package.add_3d_model(Package3DModel(uuid_3d, Name(name_3d)))
-                generated_3d_uuids.add(uuid_3d)
-            footprint.add_3d_model(Footprint3DModel(uuid_3d))
-
-            return footprint
-
-        def _add_vertical_footprint(
-            package: Package,
-            name: str,
-            identifier_suffix: str,
-            identifier_3d: str,
-            pad_size: Size,
+        # Now the interesting part: The circles with the flattened side.
+        # For this, we use a polygon with a circle segment.
+        def _add_flattened_circle(
+            footprint: Footprint,
+            identifier: str,
+            layer_name: str,
+            outer_radius: float,
+            inner_radius: float,
+            line_width: float,
+            reduced: bool = False,
         ) -> None:
-            footprint = _add_footprint(
-                package=package,
-                identifier_suffix=identifier_suffix,
-                identifier_3d=identifier_3d,
-                name=name,
-                pad_size=pad_size,
-                vertical=True,
-                horizontal_offset=0,
-            )
+            """
+            Generate a flattened circle. The flat side will be on the left.
 
-            # Now the interesting part: The circles with the flattened side.
-            # For this, we use a polygon with a circle segment.
-            def _add_flattened_circle(
-                footprint: Footprint,
-                identifier: str,
-                layer: str,
-                outer_radius: float,
-                inner_radius: float,
-                line_width: float,
-                reduced: bool = False,
-            ) -> None:
-                """
-                Generate a flattened circle. The flat side will be on the left.
-
-                If outer_radius == inner_radius, then a circle will be created instead.
-
-                If `reduced` is true, then a reduced version (only top and bottom
-                circle segments) will be generated.
-
-                """
-                # Special case: If outer_radius == inner_radius, return a full circle.
-                if outer_radius == inner_radius:
-                    footprint.add_circle(
-                        Circle(
-                            uuid=_uuid(identifier),
-                            layer=Layer(layer),
-                            width=Width(line_width),
-                            position=Position(0, 0),
-                            diameter=Diameter(outer_radius * 2),
-                            fill=Fill(False),
-                            grab_area=GrabArea(False),
-                        )
-                    )
-                    return
+            If outer_radius == inner_radius, then a circle will be created instead.
 
-                # To calculate the y offset of the flat side, use Pythagoras
-                y = sqrt(outer_radius**2 - inner_radius**2)
+            If `reduced` is true, then a reduced version (only top and bottom
+            circle segments) will be generated.
 
-                # Now we can calculate the angle of the circle segment
-                if reduced:
-                    angle = degrees(2 * asin(inner_radius / outer_radius))
-                else:
-                    angle = 180 - degrees(acos(inner_radius / outer_radius))
+            """
+            width = Width(line_width)
 
-                # Generate polygon
-                if not reduced:
-                    # Regular polygon with flattened side
-                    polygon = Polygon(
+            # Special case: If outer_radius == inner_radius, return a full circle.
+            if outer_radius == inner_radius:
+                footprint.add_circle(
+                    Circle(
                         uuid=_uuid(identifier),
-                        layer=Layer(layer),
-                        width=Width(line_width),
-                        fill=Fill(False),
-                        grab_area=GrabArea(False),
+                        layer=shared_layer(layer_name),
+                        width=width,
+                        position=Position(0, 0),
+                        diameter=Diameter(outer_radius * 2),
+                        fill=fill_false,
+                        grab_area=grab_area_false,
                     )
-                    polygon.add_vertex(Vertex(Position(-inner_radius, -y), Angle(angle)))
-                    polygon.add_vertex(Vertex(Position(outer_radius, 0), Angle(angle)))
-                    polygon.add_vertex(Vertex(Position(-inner_radius, y), Angle(0)))
-                    polygon.add_vertex(Vertex(Position(-inner_radius, -y), Angle(0)))
-                    footprint.add_polygon(polygon)
-                else:
-                    # Reduced two-part polygon
-                    for y, suffix in [(y, '-top'), (-y, '-bot')]:
-                        polygon = Polygon(
-                            uuid=_uuid(identifier + suffix),
-                            layer=Layer(layer),
-                            width=Width(line_width),
-                            fill=Fill(False),
-                            grab_area=GrabArea(False),
-                        )
-                        polygon.add_vertex(
-                            Vertex(Position(inner_radius, y), Angle(angle if y > 0 else -angle))
-                        )
-                        polygon.add_vertex(Vertex(Position(-inner_radius, y), Angle(0)))
-                        polygon.add_vertex(Vertex(Position(-inner_radius, y * 0.80), Angle(0)))
-                        footprint.add_polygon(polygon)
-
-            _add_flattened_circle(
-                footprint,
-                identifier='polygon-doc' + identifier_suffix,
-                layer='top_documentation',
-                outer_radius=config.bot_diameter / 2 - default_line_width / 2,
-                inner_radius=config.top_diameter / 2 - default_line_width / 2,
-                line_width=default_line_width,
-            )
-            _add_flattened_circle(
-                footprint,
-                identifier='polygon-legend' + identifier_suffix,
-                layer='top_legend',
-                outer_radius=config.bot_diameter / 2 + default_line_width / 2,
-                inner_radius=config.top_diameter / 2 + default_line_width / 2,
-                line_width=default_line_width,
-                reduced=is_small,
-            )
-
-            # Package outline
-            _add_flattened_circle(
-                footprint,
-                identifier='polygon-outline' + identifier_suffix,
-                layer='top_package_outlines',
-                outer_radius=config.bot_diameter / 2,
-                inner_radius=config.top_diameter / 2,
-                line_width=0,
-                reduced=False,
-            )
-
-            # Courtyard
-            courtyard_offset = (1.0 if config.bot_diameter >= 10.0 else 0.8) / 2
-            pad_ring_x_bounds = config.lead_spacing / 2 + pad_size.height / 2
-            _add_flattened_circle(
-                footprint,
-                identifier='polygon-courtyard' + identifier_suffix,
-                layer='top_courtyard',
-                outer_radius=max(config.bot_diameter / 2, pad_ring_x_bounds) + courtyard_offset,
-                inner_radius=max(config.top_diameter / 2, pad_ring_x_bounds) + courtyard_offset,
-                line_width=0.0,
-            )
-
-            # Text
-            footprint.add_text(
-                StrokeText(
-                    uuid=_uuid('text-name' + identifier_suffix),
-                    layer=Layer('top_names'),
-                    height=Height(1.0),
-                    stroke_width=StrokeWidth(0.2),
-                    letter_spacing=LetterSpacing.AUTO,
-                    line_spacing=LineSpacing.AUTO,
-                    align=Align('center bottom'),
-                    position=Position(0.0, (config.bot_diameter / 2) + 0.8),
-                    rotation=Rotation(0.0),
-                    auto_rotate=AutoRotate(True),
-                    mirror=Mirror(False),
-                    value=Value('{{NAME}}'),
-                )
-            )
-            footprint.add_text(
-                StrokeText(
-                    uuid=_uuid('text-value' + identifier_suffix),
-                    layer=Layer('top_values'),
-                    height=Height(1.0),
-                    stroke_width=StrokeWidth(0.2),
-                    letter_spacing=LetterSpacing.AUTO,
-                    line_spacing=LineSpacing.AUTO,
-                    align=Align('center top'),
-                    position=Position(0.0, -(config.bot_diameter / 2) - 0.8),
-                    rotation=Rotation(0.0),
-                    auto_rotate=AutoRotate(True),
-                    mirror=Mirror(False),
-                    value=Value('{{VALUE}}'),
                 )
-            )
+                return
 
-        def _add_horizontal_footprint(
-            package: Package,
-            name: str,
-            identifier_suffix: str,
-            identifier_3d: str,
-            pad_size: Size,
-            body_height: float,
-            body_offset: float,
-        ) -> None:
-            footprint = _add_footprint(
-                package=package,
-                identifier_suffix=identifier_suffix,
-                identifier_3d=identifier_3d,
-                name=name,
-                pad_size=pad_size,
-                vertical=False,
-                horizontal_offset=body_offset,
-            )
+            y, segment_angle = flattened_circle_geometry(outer_radius, inner_radius, reduced)
 
-            # Documentation outline
-            polygon = Polygon(
-                uuid=_uuid('polygon-doc' + identifier_suffix),
-                layer=Layer('top_documentation'),
-                width=Width(default_line_width),
-                fill=Fill(False),
-                grab_area=GrabArea(False),
-            )
-            inner_radius = config.top_diameter / 2 - default_line_width / 2
-            outer_radius = config.bot_diameter / 2 - default_line_width / 2
-            body_bottom_y = body_offset + default_line_width / 2
-            body_middle_y = body_bottom_y + 1.0 - default_line_width
-            body_top_y = body_bottom_y + body_height - inner_radius - default_line_width
-            polygon.add_vertex(Vertex(Position(-inner_radius, body_middle_y), Angle(0)))
-            polygon.add_vertex(Vertex(Position(-inner_radius, body_top_y), Angle(-180)))
-            polygon.add_vertex(Vertex(Position(inner_radius, body_top_y), Angle(0)))
-            polygon.add_vertex(Vertex(Position(inner_radius, body_middle_y), Angle(0)))
-            polygon.add_vertex(Vertex(Position(outer_radius, body_middle_y), Angle(0)))
-            polygon.add_vertex(Vertex(Position(outer_radius, body_bottom_y), Angle(0)))
-            polygon.add_vertex(Vertex(Position(-inner_radius, body_bottom_y), Angle(0)))
-            polygon.add_vertex(Vertex(Position(-inner_radius, body_middle_y), Angle(0)))
-            polygon.add_vertex(Vertex(Position(inner_radius, body_middle_y), Angle(0)))
-            footprint.add_polygon(polygon)
-
-            # Documentation leads
-            for pad, factor in [('a', 1), ('c', -1)]:
+            # Generate polygon
+            if not reduced:
+                # Regular polygon with flattened side
                 polygon = Polygon(
-                    uuid=_uuid('polygon-doc-' + pad + identifier_suffix),
-                    layer=Layer('top_documentation'),
-                    width=Width(0),
-                    fill=Fill(True),
-                    grab_area=GrabArea(False),
+                    uuid=_uuid(identifier),
+                    layer=shared_layer(layer_name),
+                    width=width,
+                    fill=fill_false,
+                    grab_area=grab_area_false,
                 )
-                x0 = (
-                    min((config.lead_spacing / 2 + lead_width / 2), config.top_diameter / 2)
-                    * factor
+                polygon.add_vertices(
+                    [
+                        Vertex(Position(-inner_radius, -y), shared_angle(segment_angle)),
+                        Vertex(Position(outer_radius, 0), shared_angle(segment_angle)),
+                        Vertex(Position(-inner_radius, y), shared_angle(0)),
+                        Vertex(Position(-inner_radius, -y), shared_angle(0)),
+                    ]
                 )
-                x1 = (2 * (config.lead_spacing / 2) - x0 * factor) * factor
-                polygon.add_vertex(Vertex(Position(x0, body_offset), Angle(0)))
-                polygon.add_vertex(Vertex(Position(x1, body_offset), Angle(0)))
-                polygon.add_vertex(Vertex(Position(x1, -lead_width / 2), Angle(0)))
-                polygon.add_vertex(Vertex(Position(x0, -lead_width / 2), Angle(0)))
-                polygon.add_vertex(Vertex(Position(x0, body_offset), Angle(0)))
                 footprint.add_polygon(polygon)
+            else:
+                # Reduced two-part polygon
+                for y, suffix in [(y, '-top'), (-y, '-bot')]:
+                    polygon = Polygon(
+                        uuid=_uuid(identifier + suffix),
+                        layer=shared_layer(layer_name),
+                        width=width,
+                        fill=fill_false,
+                        grab_area=grab_area_false,
+                    )
+                    polygon.add_vertices(
+                        [
+                            Vertex(
+                                Position(inner_radius, y),
+                                shared_angle(segment_angle if y > 0 else -segment_angle),
+                            ),
+                            Vertex(Position(-inner_radius, y), shared_angle(0)),
+                            Vertex(Position(-inner_radius, y * 0.80), shared_angle(0)),
+                        ]
+                    )
+                    footprint.add_polygon(polygon)
 
-            # Determine legend variant
-            body_bottom_y -= default_line_width
-            pad_legend_clearance = pad_size.width / 2 + default_line_width / 2 + 0.18
-            split_legend = body_bottom_y < pad_legend_clearance
+        _add_flattened_circle(
+            footprint,
+            identifier='polygon-doc' + identifier_suffix,
+            layer_name='top_documentation',
+            outer_radius=config.doc_outer_radius,
+            inner_radius=config.doc_inner_radius,
+            line_width=default_line_width,
+        )
+        _add_flattened_circle(
+            footprint,
+            identifier='polygon-legend' + identifier_suffix,
+            layer_name='top_legend',
+            outer_radius=config.legend_outer_radius,
+            inner_radius=config.legend_inner_radius,
+            line_width=default_line_width,
+            reduced=is_small,
+        )
 
-            # legend short
-            if split_legend:
-                polygon = Polygon(
-                    uuid=_uuid('polygon-legend2' + identifier_suffix),
-                    layer=Layer('top_legend'),
-                    width=Width(default_line_width),
-                    fill=Fill(False),
-                    grab_area=GrabArea(False),
-                )
-                legend_x = config.lead_spacing / 2 - pad_legend_clearance
-                polygon.add_vertex(Vertex(Position(-legend_x, body_bottom_y), Angle(0)))
-                polygon.add_vertex(Vertex(Position(legend_x, body_bottom_y), Angle(0)))
-                footprint.add_polygon(polygon)
+        # Package outline
+        _add_flattened_circle(
+            footprint,
+            identifier='polygon-outline' + identifier_suffix,
+            layer_name='top_package_outlines',
+            outer_radius=config.bot_radius,
+            inner_radius=config.top_radius,
+            line_width=0,
+            reduced=False,
+        )
 
-            # legend outline
-            polygon = Polygon(
-                uuid=_uuid('polygon-legend' + identifier_suffix),
-                layer=Layer('top_legend'),
-                width=Width(default_line_width),
-                fill=Fill(False),
-                grab_area=GrabArea(False),
-            )
-            inner_radius = config.top_diameter / 2 + default_line_width / 2
-            outer_radius = config.bot_diameter / 2 + default_line_width / 2
-            body_bottom_silkscreen_x = config.lead_spacing / 2 + pad_legend_clearance
-            body_bottom_silkscreen_y = max(body_bottom_y, pad_legend_clearance)
-            body_middle_y += default_line_width
-            if split_legend is False:
-                polygon.add_vertex(Vertex(Position(-inner_radius, body_bottom_y), Angle(0)))
-            elif body_bottom_silkscreen_x < inner_radius:
-                polygon.add_vertex(
-                    Vertex(Position(-body_bottom_silkscreen_x, body_bottom_y), Angle(0))
-                )
-                polygon.add_vertex(Vertex(Position(-inner_radius, body_bottom_y), Angle(0)))
-            else:
-                polygon.add_vertex(
-                    Vertex(Position(-inner_radius, body_bottom_silkscreen_y), Angle(0))
-                )
-            polygon.add_vertex(Vertex(Position(-inner_radius, body_top_y), Angle(-180)))
-            polygon.add_vertex(Vertex(Position(inner_radius, body_top_y), Angle(0)))
-            polygon.add_vertex(Vertex(Position(inner_radius, body_middle_y), Angle(0)))
-            polygon.add_vertex(Vertex(Position(outer_radius, body_middle_y), Angle(0)))
-            if split_legend is False:
-                polygon.add_vertex(Vertex(Position(outer_radius, body_bottom_y), Angle(0)))
-                polygon.add_vertex(Vertex(Position(-inner_radius, body_bottom_y), Angle(0)))
-            elif body_bottom_silkscreen_x < outer_radius:
-                polygon.add_vertex(Vertex(Position(outer_radius, body_bottom_y), Angle(0)))
-                polygon.add_vertex(
-                    Vertex(Position(body_bottom_silkscreen_x, body_bottom_y), Angle(0))
-                )
-            else:
-                polygon.add_vertex(
-                    Vertex(Position(outer_radius, body_bottom_silkscreen_y), Angle(0))
-                )
-            footprint.add_polygon(polygon)
-
-            # Package outline
-            def _generate_outline(offset: float = 0, pad_offset: float = 0) -> List[Vertex]:
-                r_inner = (config.top_diameter / 2) + offset
-                r_outer = (config.bot_diameter / 2) + offset
-                body_y_mid = body_bottom_y + 1.0 + (default_line_width / 2) + offset
-                body_y_bot = body_offset - offset
-                leads_x = min(
-                    config.lead_spacing / 2 + lead_width / 2 + offset + pad_offset, r_inner
-                )
-                leads_y = -lead_width / 2 - offset - pad_offset
-                return [
-                    Vertex(Position(-r_inner, body_y_bot), Angle(0)),
-                    Vertex(Position(-r_inner, body_top_y), Angle(-180)),
-                    Vertex(Position(r_inner, body_top_y), Angle(0)),
-                    Vertex(Position(r_inner, body_y_mid), Angle(0)),
-                    Vertex(Position(r_outer, body_y_mid), Angle(0)),
-                    Vertex(Position(r_outer, body_y_bot), Angle(0)),
-                    Vertex(Position(leads_x, body_y_bot), Angle(0)),
-                    Vertex(Position(leads_x, leads_y), Angle(0)),
-                    Vertex(Position(-leads_x, leads_y), Angle(0)),
-                    Vertex(Position(-leads_x, body_y_bot), Angle(0)),
-                ]
+        # Courtyard
+        pad_ring_x_bounds = config.lead_spacing / 2 + pad_size.height / 2
+        _add_flattened_circle(
+            footprint,
+            identifier='polygon-courtyard' + identifier_suffix,
+            layer_name='top_courtyard',
+            outer_radius=max(config.bot_radius, pad_ring_x_bounds) + config.courtyard_offset,
+            inner_radius=max(config.top_radius, pad_ring_x_bounds) + config.courtyard_offset,
+            line_width=0.0,
+        )
 
-            footprint.add_polygon(
-                Polygon(
-                    uuid=_uuid('polygon-outline' + identifier_suffix),
-                    layer=Layer('top_package_outlines'),
-                    width=Width(0.0),
-                    fill=Fill(False),
-                    grab_area=GrabArea(False),
-                    vertices=_generate_outline(),
-                )
+        # Text
+        footprint.add_text(
+            StrokeText(
+                uuid=_uuid('text-name' + identifier_suffix),
+                layer=shared_layer('top_names'),
+                height=text_height,
+                stroke_width=text_stroke_width,
+                letter_spacing=LetterSpacing.AUTO,
+                line_spacing=LineSpacing.AUTO,
+                align=text_align_bottom,
+                position=Position(0.0, config.bot_radius + 0.8),
+                rotation=shared_rotation(0.0),
+                auto_rotate=text_auto_rotate,
+                mirror=text_mirror,
+                value=text_value_name,
             )
+        )
+        footprint.add_text(
+            StrokeText(
+                uuid=_uuid('text-value' + identifier_suffix),
+                layer=shared_layer('top_values'),
+                height=text_height,
+                stroke_width=text_stroke_width,
+                letter_spacing=LetterSpacing.AUTO,
+                line_spacing=LineSpacing.AUTO,
+                align=text_align_top,
+                position=Position(0.0, -config.bot_radius - 0.8),
+                rotation=shared_rotation(0.0),
+                auto_rotate=text_auto_rotate,
+                mirror=text_mirror,
+                value=text_value_value,
+            )
+        )
+
+    def _add_horizontal_footprint(
+        package: Package,
+        name: str,
+        identifier_suffix: str,
+        identifier_3d: str,
+        body_offset: float,
+    ) -> None:
+        footprint = _add_footprint(
+            package=package,
+            identifier_suffix=identifier_suffix,
+            identifier_3d=identifier_3d,
+            name=name,
+            pad_size=pad_size_default,
+            vertical=False,
+            horizontal_offset=body_offset,
+        )
 
-            # Courtyard
-            courtyard_offset = 0.5 if config.bot_diameter >= 10.0 else 0.4
+        # Polygons
+        for identifier, layer_name, width, fill, vertices in horizontal_footprint_polygons(
+            config, body_offset
+        ):
             footprint.add_polygon(
                 Polygon(
-                    uuid=_uuid('polygon-courtyard' + identifier_suffix),
-                    layer=Layer('top_courtyard'),
-                    width=Width(0.0),
-                    fill=Fill(False),
-                    grab_area=GrabArea(False),
-                    vertices=_generate_outline(courtyard_offset, 0.1),
+                    uuid=_uuid(identifier + identifier_suffix),
+                    layer=shared_layer(layer_name),
+                    width=width,
+                    fill=fill,
+                    grab_area=grab_area_false,
+                    vertices=list(vertices),
                 )
             )
 
-            # Text
-            footprint.add_text(
-                StrokeText(
-                    uuid=_uuid('text-name' + identifier_suffix),
-                    layer=Layer('top_names'),
-                    height=Height(1.0),
-                    stroke_width=StrokeWidth(0.2),
-                    letter_spacing=LetterSpacing.AUTO,
-                    line_spacing=LineSpacing.AUTO,
-                    align=Align('center top'),
-                    position=Position(0.0, -1.27),
-                    rotation=Rotation(0.0),
-                    auto_rotate=AutoRotate(True),
-                    mirror=Mirror(False),
-                    value=Value('{{NAME}}'),
-                )
+        # Text
+        footprint.add_text(
+            StrokeText(
+                uuid=_uuid('text-name' + identifier_suffix),
+                layer=shared_layer('top_names'),
+                height=text_height,
+                stroke_width=text_stroke_width,
+                letter_spacing=LetterSpacing.AUTO,
+                line_spacing=LineSpacing.AUTO,
+                align=text_align_top,
+                position=Position(0.0, -1.27),
+                rotation=shared_rotation(0.0),
+                auto_rotate=text_auto_rotate,
+                mirror=text_mirror,
+                value=text_value_name,
             )
-            footprint.add_text(
-                StrokeText(
-                    uuid=_uuid('text-value' + identifier_suffix),
-                    layer=Layer('top_values'),
-                    height=Height(1.0),
-                    stroke_width=StrokeWidth(0.2),
-                    letter_spacing=LetterSpacing.AUTO,
-                    line_spacing=LineSpacing.AUTO,
-                    align=Align('center top'),
-                    position=Position(0.0, -3.0),
-                    rotation=Rotation(0.0),
-                    auto_rotate=AutoRotate(True),
-                    mirror=Mirror(False),
-                    value=Value('{{VALUE}}'),
-                )
+        )
+        footprint.add_text(
+            StrokeText(
+                uuid=_uuid('text-value' + identifier_suffix),
+                layer=shared_layer('top_values'),
+                height=text_height,
+                stroke_width=text_stroke_width,
+                letter_spacing=LetterSpacing.AUTO,
+                line_spacing=LineSpacing.AUTO,
+                align=text_align_top,
+                position=Position(0.0, -3.0),
+                rotation=shared_rotation(0.0),
+                auto_rotate=text_auto_rotate,
+                mirror=text_mirror,
+                value=text_value_value,
             )
+        )
 
-        # Add footprints
+    # Add footprints
+    _add_vertical_footprint(
+        package,
+        name='Vertical',
+        identifier_suffix='',
+        identifier_3d='v',
+        pad_size=pad_size_default,
+    )
+    if not is_small:
         _add_vertical_footprint(
             package,
-            name='Vertical',
-            identifier_suffix='',
+            name='Vertical, Large Pads',
+            identifier_suffix='-large',
             identifier_3d='v',
-            pad_size=Size(1.4, 1.4),
-        )
-        if not is_small:
-            _add_vertical_footprint(
-                package,
-                name='Vertical, Large Pads',
-                identifier_suffix='-large',
-                identifier_3d='v',
-                pad_size=Size(2.5, 1.3),
-            )
-        _add_horizontal_footprint(
-            package,
-            name='Horizontal, 0.5 mm Offset',
-            identifier_suffix='-h050',
-            identifier_3d='h050',
-            pad_size=Size(1.4, 1.4),
-            body_height=config.body_height,
-            body_offset=0.5,
-        )
-        _add_horizontal_footprint(
-            package,
-            name='Horizontal, 2.54 mm Offset',
-            identifier_suffix='-h254',
-            identifier_3d='h254',
-            pad_size=Size(1.4, 1.4),
-            body_height=config.body_height,
-            body_offset=2.54,
-        )
-        _add_horizontal_footprint(
-            package,
-            name='Horizontal, 7.62 mm Offset',
-            identifier_suffix='-h762',
-            identifier_3d='h762',
-            pad_size=Size(1.4, 1.4),
-            body_height=config.body_height,
-            body_offset=7.62,
+            pad_size=pad_size_large,
         )
+    _add_horizontal_footprint(
+        package,
+        name='Horizontal, 0.5 mm Offset',
+        identifier_suffix='-h050',
+        identifier_3d='h050',
+        body_offset=0.5,
+    )
+    _add_horizontal_footprint(
+        package,
+        name='Horizontal, 2.54 mm Offset',
+        identifier_suffix='-h254',
+        identifier_3d='h254',
+        body_offset=2.54,
+    )
+    _add_horizontal_footprint(
+        package,
+        name='Horizontal, 7.62 mm Offset',
+        identifier_suffix='-h762',
+        identifier_3d='h762',
+        body_offset=7.62,
+    )
 
-        package.serialize(path.join('out', library, category))
+    return package, new_cache_entries(uuid_cache, cache_size)
 
 
 def generate_3d(
@@ -792,10 +983,9 @@ def generate_dev(
     create_date: Optional[str],
 ) -> None:
     category = 'dev'
+    devices: List[Device] = []
     for config in configs:
-
-        def _uuid(identifier: str) -> str:
-            return uuid(category, config.dev_name, identifier)
+        _uuid = partial(uuid, category, config.dev_name)
 
         uuid_dev = _uuid('dev')
 
@@ -828,7 +1018,11 @@ def generate_dev(
             )
         )
 
-        device.serialize(path.join('out', library, category))
+        devices.append(device)
+
+    output_directory = path.join('out', library, category)
+    for device in devices:
+        device.serialize(output_directory)
 
 
 if __name__ == '__main__':
@@ -2,12 +2,13 @@
 Generate dual mosfet devices.
 """
 
+from io import StringIO
 from os import makedirs, path
 from uuid import uuid4
 
 from typing import Any, Dict, Iterable, List, Optional
 
-from common import init_cache, now, save_cache
+from common import init_cache, now, save_cache, write_file_if_changed
 
 generator = 'librepcb-parts-generator (generate_mosfet_dual.py)'
 
@@ -112,8 +113,6 @@ def generate_dev(
     configs: Iterable[FetConfig],
 ) -> None:
     for fet_config in configs:
-        lines = []
-
         fmt_params: Dict[str, Any] = {
             'name': fet_config.name,
             'max_voltage': fet_config.max_voltage,
@@ -144,33 +143,32 @@ def generate_dev(
             datasheet = ''
 
         print('Generating dev "{}": {}'.format(full_name, uuid_dev))
-        lines.append('(librepcb_device {}'.format(uuid_dev))
-        lines.append(' (name "{}")'.format(full_name))
-        lines.append(
-            ' (description "{}\\n\\n{}Generated with {}")'.format(full_desc, datasheet, generator)
+        buf = StringIO()
+        write = buf.write
+        write('(librepcb_device {}\n'.format(uuid_dev))
+        write(' (name "{}")\n'.format(full_name))
+        write(
+            ' (description "{}\\n\\n{}Generated with {}")\n'.format(full_desc, datasheet, generator)
         )
-        lines.append(' (keywords "{}")'.format(keywords))
-        lines.append(' (author "{}")'.format(author))
-        lines.append(' (version "{}")'.format(version))
-        lines.append(' (created {})'.format(create_date or now()))
-        lines.append(' (deprecated false)')
-        lines.append(' (category {})'.format(uuid_cat))
-        lines.append(' (component {})'.format(uuid_cmp))
-        lines.append(' (package {})'.format(uuid_pkg))
+        write(' (keywords "{}")\n'.format(keywords))
+        write(' (author "{}")\n'.format(author))
+        write(' (version "{}")\n'.format(version))
+        write(' (created {})\n'.format(create_date or now()))
+        write(' (deprecated false)\n')
+        write(' (category {})\n'.format(uuid_cat))
+        write(' (component {})\n'.format(uuid_cmp))
+        write(' (package {})\n'.format(uuid_pkg))
         pad_signal_mappings = []
         for pad, signal in zip(uuid_pads, uuid_signals):
-            pad_signal_mappings.append(' (pad {} (signal {}))'.format(pad, signal))
-        lines.extend(sorted(pad_signal_mappings))
-        lines.append(')')
+            pad_signal_mappings.append(' (pad {} (signal {}))\n'.format(pad, signal))
+        for mapping in sorted(pad_signal_mappings):
+            write(mapping)
+        write(')\n')
 
         dev_dir_path = path.join('out', library, 'dev', uuid_dev)
-        if not (path.exists(dev_dir_path) and path.isdir(dev_dir_path)):
-            makedirs(dev_dir_path)
-        with open(path.join(dev_dir_path, '.librepcb-dev'), 'w') as f:
-            f.write('0.1\n')
-        with open(path.join(dev_dir_path, 'device.lp'), 'w') as f:
-            f.write('\n'.join(lines))
-            f.write('\n')
+        makedirs(dev_dir_path, exist_ok=True)
+        write_file_if_changed(path.join(dev_dir_path, '.librepcb-dev'), '0.1\n')
+        write_file_if_changed(path.join(dev_dir_path, 'device.lp'), buf.getvalue())
 
 
 if __name__ == '__main__':
@@ -1,6 +1,26 @@
+import os
+from pathlib import Path
+from uuid import UUID
+
+from typing import Dict, Tuple
+
 import pytest
 
-from common import escape_string, format_float, format_ipc_dimension, human_sort_key, sign
+from common import (
+    UUID_POOL_SIZE,
+    escape_string,
+    format_float,
+    format_ipc_dimension,
+    generate_all,
+    human_sort_key,
+    init_cache,
+    init_cache_worker,
+    new_cache_entries,
+    new_uuid,
+    save_cache,
+    serialize_common,
+    sign,
+)
 
 
 @pytest.mark.parametrize(
@@ -82,3 +102,95 @@ def test_human_sort_key(inval, outval):
 )
 def test_human_sort_key_list(inlist, sortedlist):
     assert sorted(inlist, key=human_sort_key) == sortedlist
+
+
+def test_new_uuid() -> None:
+    uuids = [new_uuid() for _ in range(UUID_POOL_SIZE * 2 + 1)]
+    assert len(set(uuids)) == len(uuids)
+    for value in uuids:
+        assert str(UUID(value)) == value
+        assert UUID(value).version == 4
+
+
+def test_serialize_common_keeps_up_to_date_marker(tmp_path: Path) -> None:
+    marker = tmp_path / 'foo' / '.librepcb-pkg'
+    serialize_common('bar', str(tmp_path), 'foo', 'package', 'pkg')
+    os.utime(marker, ns=(0, 0))
+    serialize_common('baz', str(tmp_path), 'foo', 'package', 'pkg')
+    assert marker.stat().st_mtime_ns == 0
+    assert (tmp_path / 'foo' / 'package.lp').read_text() == 'baz\n'
+
+
+def test_serialize_common_keeps_up_to_date_file(tmp_path: Path) -> None:
+    lp_file = tmp_path / 'foo' / 'package.lp'
+    serialize_common('bar', str(tmp_path), 'foo', 'package', 'pkg')
+    os.utime(lp_file, ns=(0, 0))
+    serialize_common('bar', str(tmp_path), 'foo', 'package', 'pkg')
+    assert lp_file.stat().st_mtime_ns == 0
+    assert sorted(os.listdir(lp_file.parent)) == ['.librepcb-pkg', 'package.lp']
+
+
+def test_serialize_common_fixes_outdated_marker(tmp_path: Path) -> None:
+    marker = tmp_path / 'foo' / '.librepcb-pkg'
+    marker.parent.mkdir()
+    marker.write_text('0\n')
+    serialize_common('bar', str(tmp_path), 'foo', 'package', 'pkg')
+    assert marker.read_text() == '1\n'
+
+
+def test_uuid_cache_roundtrip(tmp_path: Path) -> None:
+    cache_file = str(tmp_path / 'uuid_cache.csv')
+    assert init_cache(cache_file) == {}
+    cache = {
+        'pkg-foo-pad-2': 'e2b1a4d6-2d69-4bf2-8d8a-3b0d8c5b7f3a',
+        'pkg-foo-pad-1': '81b0a7f0-4c1b-4c29-9b8e-5a3bd5a5c7b1',
+        'cmp-"bar",baz-signal': '0d6b1c0e-5a30-4bb0-9a3c-5e5f4b06b0a4',
+    }
+    save_cache(cache_file, cache)
+    loaded = init_cache(cache_file)
+    assert loaded == cache
+    assert list(loaded) == sorted(cache)
+    assert os.listdir(tmp_path) == ['uuid_cache.csv']
+
+
+def test_save_cache_skips_unchanged_cache(tmp_path: Path) -> None:
+    cache_file = tmp_path / 'uuid_cache.csv'
+    cache_file.write_text('pkg-foo-pad-1,81b0a7f0-4c1b-4c29-9b8e-5a3bd5a5c7b1\n')
+    cache = init_cache(str(cache_file))
+    cache_file.write_text('modified\n')
+    save_cache(str(cache_file), cache)
+    assert cache_file.read_text() == 'modified\n'
+    cache['pkg-foo-pad-2'] = 'e2b1a4d6-2d69-4bf2-8d8a-3b0d8c5b7f3a'
+    save_cache(str(cache_file), cache)
+    assert init_cache(str(cache_file)) == cache
+
+
+def test_init_cache_worker(tmp_path: Path) -> None:
+    cache_file = str(tmp_path / 'uuid_cache.csv')
+    cache = init_cache(cache_file)
+    init_cache_worker(cache_file, {'pkg-foo-pkg': 'e2b1a4d6-2d69-4bf2-8d8a-3b0d8c5b7f3a'})
+    assert cache == {'pkg-foo-pkg': 'e2b1a4d6-2d69-4bf2-8d8a-3b0d8c5b7f3a'}
+    init_cache_worker(cache_file, cache)
+    assert cache == {'pkg-foo-pkg': 'e2b1a4d6-2d69-4bf2-8d8a-3b0d8c5b7f3a'}
+
+
+def test_new_cache_entries() -> None:
+    cache = {'a': '1', 'b': '2'}
+    cache_size = len(cache)
+    assert new_cache_entries(cache, cache_size) == {}
+    cache['d'] = '4'
+    cache['c'] = '3'
+    assert new_cache_entries(cache, cache_size) == {'c': '3', 'd': '4'}
+
+
+def _generate_square(x: int) -> Tuple[int, Dict[str, str]]:
+    return x * x, {f'square-{x}': str(x * x)}
+
+
+@pytest.mark.parametrize('parallel', [False, True])
+def test_generate_all(tmp_path: Path, parallel: bool) -> None:
+    cache_file = str(tmp_path / 'uuid_cache.csv')
+    cache = init_cache(cache_file)
+    results = generate_all(_generate_square, [(1,), (2,), (3,)], cache_file, cache, parallel)
+    assert results == [1, 4, 9]
+    assert cache == {'square-1': '1', 'square-2': '4', 'square-3': '9'}
@@ -1,5 +1,7 @@
 from pathlib import Path
 
+import pytest
+
 from entities.common import (
     Align,
     Angle,
@@ -28,6 +30,8 @@ from entities.common import (
     Version,
     Vertex,
     Width,
+    shared_layer,
+    shared_rotation,
 )
 from entities.component import (
     Clock,
@@ -100,6 +104,24 @@ def test_rotation() -> None:
     assert rotation_s_exp == '(rotation 180.0)'
 
 
+def test_shared_value_objects() -> None:
+    assert shared_layer('top_legend') is shared_layer('top_legend')
+    assert str(shared_layer('top_legend')) == '(layer top_legend)'
+    assert shared_rotation(0.0) is shared_rotation(0.0)
+    assert shared_rotation(0.0) is not shared_rotation(90.0)
+    assert isinstance(shared_rotation(0.0), Rotation)
+    with pytest.raises(AttributeError):
+        shared_rotation(0.0).value = 90.0
+    assert str(shared_rotation(0.0)) == '(rotation 0.0)'
+
+
+def test_frozen_float_value() -> None:
+    diameter = DrillDiameter(1.0)
+    with pytest.raises(AttributeError):
+        diameter.value = 2.0
+    assert str(diameter) == '(diameter 1.0)'
+
+
 def test_length() -> None:
     length_s_exp = str(Length(3.81))
     assert length_s_exp == '(length 3.81)'
@@ -145,9 +167,13 @@ def test_polygon() -> None:
     )
     polygon.add_vertex(Vertex(Position(-2.54, 22.86), Angle(0.0)))
     polygon.add_vertex(Vertex(Position(2.54, 22.86), Angle(0.0)))
-    polygon.add_vertex(Vertex(Position(2.54, -25.4), Angle(0.0)))
-    polygon.add_vertex(Vertex(Position(-2.54, -25.4), Angle(0.0)))
-    polygon.add_vertex(Vertex(Position(-2.54, 22.86), Angle(0.0)))
+    polygon.add_vertices(
+        [
+            Vertex(Position(2.54, -25.4), Angle(0.0)),
+            Vertex(Position(-2.54, -25.4), Angle(0.0)),
+            Vertex(Position(-2.54, 22.86), Angle(0.0)),
+        ]
+    )
 
     assert (
         str(polygon)
@@ -610,6 +636,25 @@ def create_footprint() -> Footprint:
     return footprint
 
 
+def create_package() -> Package:
+    return Package(
+        '009e35ef-1f50-4bf3-ab58-11eb85bf5503',
+        Name('Soldered Wire Connector 1x19 ⌀1.0mm'),
+        Description(
+            'A 1x19 soldered wire connector with 2.54mm pin spacing and 1.0mm drill holes.\n\n'
+            'Generated with librepcb-parts-generator (generate_connectors.py)'
+        ),
+        Keywords('connector, 1x19, d1.0, connector, soldering, generic'),
+        Author('Danilo B.'),
+        Version('0.1'),
+        Created('2018-10-17T19:13:41Z'),
+        Deprecated(False),
+        GeneratedBy('black magic'),
+        [Category('56a5773f-eeb4-4b39-8cb9-274f3da26f4f')],
+        AssemblyType.THT,
+    )
+
+
 def test_footprint() -> None:
     footprint = create_footprint()
     assert (
@@ -652,23 +697,14 @@ def test_footprint() -> None:
     )
 
 
+def test_footprint_duplicate_3d_model() -> None:
+    footprint = create_footprint()
+    footprint.add_3d_model(Footprint3DModel('ea459880-68df-4929-b796-b5c8686a1862'))
+    assert str(footprint) == str(create_footprint())
+
+
 def test_package() -> None:
-    package = Package(
-        '009e35ef-1f50-4bf3-ab58-11eb85bf5503',
-        Name('Soldered Wire Connector 1x19 ⌀1.0mm'),
-        Description(
-            'A 1x19 soldered wire connector with 2.54mm pin spacing and 1.0mm drill holes.\n\n'
-            'Generated with librepcb-parts-generator (generate_connectors.py)'
-        ),
-        Keywords('connector, 1x19, d1.0, connector, soldering, generic'),
-        Author('Danilo B.'),
-        Version('0.1'),
-        Created('2018-10-17T19:13:41Z'),
-        Deprecated(False),
-        GeneratedBy('black magic'),
-        [Category('56a5773f-eeb4-4b39-8cb9-274f3da26f4f')],
-        AssemblyType.THT,
-    )
+    package = create_package()
 
     package.add_pad(PackagePad('5c4d39d3-35cc-4836-a082-693143ee9135', Name('1')))
     package.add_pad(PackagePad('6100dd55-d3b3-4139-9085-d5a75e783c37', Name('2')))
@@ -822,6 +858,25 @@ def test_sort_footprint_3d_models() -> None:
     assert sorted(models) == [model2, model1]
 
 
+def test_package_approvals_added_after_serialization() -> None:
+    package = create_package()
+    package.add_approval('(approval foo)')
+    assert str(package).endswith(' (approval foo)\n)')
+    package.add_approval('(approval bar)')
+    assert str(package).endswith(' (approval bar)\n (approval foo)\n)')
+
+
+def test_package_footprint_modified_after_serialization() -> None:
+    package = create_package()
+    footprint = create_footprint()
+    package.add_footprint(footprint)
+    serialized = str(package)
+    assert str(package) is serialized
+    footprint.add_3d_model(Footprint3DModel('00b6a3a5-7a2c-4d5e-9a38-44c7d4ae2c6b'))
+    assert '(3d_model 00b6a3a5-7a2c-4d5e-9a38-44c7d4ae2c6b)' not in serialized
+    assert '  (3d_model 00b6a3a5-7a2c-4d5e-9a38-44c7d4ae2c6b)\n' in str(package)
+
+
 def check_all_file_newlines_in_dir_are_unix(dir_with_files: Path) -> bool:
     """
     Checks if all files in the given directory have Unix-style line endings